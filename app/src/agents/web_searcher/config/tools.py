@@ -1,5 +1,5 @@
 from langchain_core.tools import tool
-from app.src.tools.web_tools import fetch
+from app.src.tools.web_tools import fetch_many
 import requests
 import os
 
@@ -129,11 +129,10 @@ def search_and_scrape(query: str) -> str:
         if not search_results:
             return "[ERROR] No search results found."
             
-        for r in search_results:
-            try:
-                r["full_text"] = fetch(r["link"])
-            except Exception:
-                r["full_text"] = "[Unable to fetch content from this link]"
+        # fetch() reports its own errors as text, so results can be
+        # fetched concurrently and assigned back in order
+        for r, full_text in zip(search_results, fetch_many([r["link"] for r in search_results])):
+            r["full_text"] = full_text
 
         formatted_results = "Web search results:\n\n"
         for r in search_results:
@@ -47,8 +47,8 @@ async def startup_event():
         
         # Load config
         config_path = os.path.join(BASE_DIR, "config.json")
-        with open(config_path) as f:
-            config = json.load(f)
+        with open(config_path, "rb") as f:
+            config = json.loads(f.read())
         
         # Initialize CLI
         api_keys = {
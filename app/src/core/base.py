@@ -4,6 +4,8 @@ from app.src.core.exception_handler import AgentExceptionHandler
 from app.src.core.permissions import PermissionDeniedException
 from app.src.embeddings.rag_errors import SetupFailedError, DBAccessError
 from collections import Counter
+from functools import lru_cache
+from itertools import islice
 import shlex
 from langchain_core.messages import AIMessage, ToolMessage, BaseMessage, HumanMessage
 from app.src.embeddings.db_client import DataBaseClient
@@ -19,6 +21,8 @@ import openai
 import re
 import sys
 import io
+import queue
+import threading
 
 # Force UTF-8 encoding on Windows to prevent UnicodeEncodeError
 if sys.platform == 'win32':
@@ -33,10 +37,29 @@ if sys.platform == 'win32':
 # HELPER FUNCTIONS FOR RAG QUERY GENERATION AND RESULT FILTERING
 # ============================================================================
 
-_STOPWORDS = {
+_STOPWORDS = frozenset({
     "the","a","an","is","are","was","were","in","on","for","and","or","of","to","with","by",
     "this","that","these","those","how","what","why","when","where","who","which"
-}
+})
+
+# Stop words for the fact-citation keywords built in _build_relevance_keywords
+_KEYWORD_STOP_WORDS = frozenset({
+    "the","and","for","with","that","this","from","about","into","have","has","was","were",
+    "are","been","their","there","which","when","your","you","they","them","she","him","his",
+    "her","not","but","can","will","just","like","into","than","is","a","an","of","to","in","on"
+})
+
+# Tokenizers for build_relevance_keywords and BaseAgent._build_relevance_keywords
+_RELEVANCE_TOKEN_RE = re.compile(r'\b[A-Za-z0-9\-]{3,}\b')
+_KEYWORD_TOKEN_RE = re.compile(r"[a-z0-9']{3,}")
+
+
+# Inline patterns in the helpers below go through _rc; the hottest ones stay module constants
+@lru_cache(maxsize=256)
+def _rc(pattern: str, flags: int = 0) -> re.Pattern:
+    """Return the compiled regex for (pattern, flags), compiling it only once."""
+    return re.compile(pattern, flags)
+
 
 _UI_NOISE_PATTERNS = [
     r'^\s*important[:\s]', r'^\s*always[:\s]', r'^\s*note[:\s]', r'^[\\/A-Za-z]:\\', r'^\s*█+',
@@ -44,6 +67,16 @@ _UI_NOISE_PATTERNS = [
 ]
 _GENERIC_NOISE = {"important","always","note","please","thanks","ok","im","i'm","imho","ciao"}
 
+# Closing marker emitted by reasoning models; everything before it is thinking
+_THINK_END = "</think>"
+_THINK_END_LEN = len(_THINK_END)
+
+# Max chunks buffered between the agent stream thread and the UI consumer
+_STREAM_QUEUE_SIZE = 64
+_STREAM_DONE = object()
+# Seconds a blocked producer waits before re-checking whether the consumer stopped
+_STREAM_PUT_TIMEOUT = 0.5
+
 
 def _clean_user_input_for_queries(raw: str) -> str:
     """Remove UI banners, paths, and obvious noise that sometimes get included in prompt text."""
@@ -53,13 +86,13 @@ def _clean_user_input_for_queries(raw: str) -> str:
         if not ln:
             continue
         # drop lines that match obvious UI/title noise
-        if any(re.search(pat, ln, re.IGNORECASE) for pat in _UI_NOISE_PATTERNS):
+        if any(_rc(pat, re.IGNORECASE).search(ln) for pat in _UI_NOISE_PATTERNS):
             continue
         # drop short one/two word lines that are clearly UI or headings
         if len(ln.split()) <= 2 and ln.lower() in _GENERIC_NOISE:
             continue
         # drop lines that look like "C:\AI-Projects\..."
-        if re.search(r'[A-Za-z]:\\', ln):
+        if _rc(r'[A-Za-z]:\\').search(ln):
             continue
         lines.append(ln)
     return " ".join(lines).strip()
@@ -75,13 +108,13 @@ def generate_search_queries(user_input: str, max_queries: int = 4) -> list[str]:
     queries = []
     
     # 1) Find capitalized multiword proper nouns (e.g., 'Shai Gilgeous-Alexander', 'IDW')
-    proper_nouns = re.findall(r'\b([A-Z][a-zA-Z0-9\-]{2,}(?:\s+[A-Z][a-zA-Z0-9\-]{2,})*)\b', ui)
+    proper_nouns = _rc(r'\b([A-Z][a-zA-Z0-9\-]{2,}(?:\s+[A-Z][a-zA-Z0-9\-]{2,})*)\b').findall(ui)
     
     # 2) Single capitalized tokens (may include acronyms)
-    caps = re.findall(r'\b([A-Z]{2,}|[A-Z][a-z]{3,})\b', ui)
+    caps = _rc(r'\b([A-Z]{2,}|[A-Z][a-z]{3,})\b').findall(ui)
     
     # 3) Long lowercase tokens (meaningful words)
-    tokens = re.findall(r'\b([a-z0-9]{4,})\b', ui.lower())
+    tokens = _rc(r'\b([a-z0-9]{4,})\b').findall(ui.lower())
     tokens = [t for t in tokens if t not in _STOPWORDS]
     
     # Prioritize multiword proper nouns with context
@@ -108,11 +141,11 @@ def generate_search_queries(user_input: str, max_queries: int = 4) -> list[str]:
                 return queries
     
     # Safety: remove any extremely short or generic queries
-    queries = [q for q in queries if len(q) >= 3 and len(re.findall(r'[A-Za-z0-9]{2,}', q)) >= 1]
+    queries = [q for q in queries if len(q) >= 3 and len(_rc(r'[A-Za-z0-9]{2,}').findall(q)) >= 1]
     
     if not queries:
         # Last resort: return first few meaningful words from input
-        words = re.findall(r'\b[A-Za-z0-9]{3,}\b', ui)
+        words = _rc(r'\b[A-Za-z0-9]{3,}\b').findall(ui)
         words = [w for w in words if w.lower() not in _STOPWORDS]
         return words[:max_queries] if words else [ui[:100]]
     
@@ -124,7 +157,7 @@ def build_relevance_keywords(user_input: str, search_queries: list[str]) -> list
     words = []
     # extract nouns/proper tokens from user_input and queries
     for s in [user_input] + search_queries:
-        for w in re.findall(r'\b[A-Za-z0-9\-]{3,}\b', s):
+        for w in _RELEVANCE_TOKEN_RE.findall(s):
             lw = w.lower()
             if lw in _STOPWORDS:
                 continue
@@ -150,18 +183,18 @@ def validate_search_results(results: list[dict], relevance_keywords: list[str])
         combined = (title + " " + snippet).lower()
 
         # reject extremely short or meaningless titles like "Is" or single-letter garbage
-        if not title or re.fullmatch(r'[a-z]{1,3}', title.strip().lower()):
+        if not title or _rc(r'[a-z]{1,3}').fullmatch(title.strip().lower()):
             continue
 
         # if any relevance keyword is a substring of the combined text, accept
         has_kw = any(kw in combined for kw in list(kw_set)[:10])  # check top keywords first
 
         # else: accept if title contains a multi-word Proper Noun phrase (e.g., "Shai Gilgeous-Alexander")
-        title_proper_phrases = re.findall(r'\b([A-Z][a-zA-Z0-9\-]{2,}(?:\s+[A-Z][a-zA-Z0-9\-]{2,})+)\b', title + " " + snippet)
+        title_proper_phrases = _rc(r'\b([A-Z][a-zA-Z0-9\-]{2,}(?:\s+[A-Z][a-zA-Z0-9\-]{2,})+)\b').findall(title + " " + snippet)
         has_proper_overlap = False
         for phrase in title_proper_phrases:
             # if any token of the detected proper phrase appears in our relevance keywords, treat as match
-            for token in re.findall(r"[A-Za-z0-9\-]{3,}", phrase):
+            for token in _rc(r"[A-Za-z0-9\-]{3,}").findall(phrase):
                 if token.lower() in kw_set:
                     has_proper_overlap = True
                     break
@@ -199,7 +232,7 @@ def needs_research(user_input: str, force_research: bool | None = None) -> bool:
         r'(has been|been|is|was|were)\s+(treated|portrayed|described|shown|claimed|promoted|criticized|attacked)',
     ]
     for p in heur_keys:
-        if re.search(p, ui):
+        if _rc(p).search(ui):
             return True
     return False
 
@@ -228,7 +261,7 @@ def duckduckgo_search_fallback(query: str, max_results: int = 10, timeout: int =
     # crude extraction of result anchors and titles
     # match href="https://..." occurrences
     links = []
-    for m in re.finditer(r'href="(https?://[^"]+)"', html):
+    for m in _rc(r'href="(https?://[^"]+)"').finditer(html):
         link = m.group(1)
         # skip duckduckgo internal links
         if "duckduckgo.com" in link:
@@ -244,7 +277,7 @@ def duckduckgo_search_fallback(query: str, max_results: int = 10, timeout: int =
         seen.add(link)
         # try to extract title by finding the anchor text nearby (fallback to link as title)
         title_match = re.search(rf'<a[^>]+href="{re.escape(link)}"[^>]*>(.*?)</a>', html, re.IGNORECASE | re.DOTALL)
-        title = re.sub(r'<.*?>', '', title_match.group(1)).strip() if title_match else link
+        title = _rc(r'<.*?>').sub('', title_match.group(1)).strip() if title_match else link
         outputs.append({"title": title, "link": link, "snippet": ""})
         if len(outputs) >= max_results:
             break
@@ -344,25 +377,22 @@ class BaseAgent:
         """
         text = f"{user_input} {enhanced_query}".strip()
         lower_text = text.lower()
-        # grab tokens (letters/numbers/') with length >=3
-        tokens = re.findall(r"[a-z0-9']{3,}", lower_text)
-
-        stop_words = {
-            "the","and","for","with","that","this","from","about","into","have","has","was","were",
-            "are","been","their","there","which","when","your","you","they","them","she","him","his",
-            "her","not","but","can","will","just","like","into","than","is","a","an","of","to","in","on"
-        }
-
-        # frequency-based keywords (lowercase)
-        freq = Counter(t for t in tokens if t not in stop_words)
-        keywords = [w for w, _ in freq.most_common(12)]
-
-        # Fallback to non-trivial tokens if frequency collapsed
-        if not keywords:
-            keywords = [t for t in tokens if len(t) > 4][:8]
+        # frequency-based keywords (lowercase) over tokens (letters/numbers/')
+        # with length >=3, streamed straight from the scan
+        freq = Counter(
+            t for t in (m.group() for m in _KEYWORD_TOKEN_RE.finditer(lower_text))
+            if t not in _KEYWORD_STOP_WORDS
+        )
+        if freq:
+            keywords = [w for w, _ in freq.most_common(12)]
+        else:
+            # Fallback to non-trivial tokens if frequency collapsed (rare, so the
+            # text is re-scanned rather than keeping a token list for every call)
+            tokens = (m.group() for m in _KEYWORD_TOKEN_RE.finditer(lower_text))
+            keywords = list(islice((t for t in tokens if len(t) > 4), 8))
 
         # Detect proper-noun phrases from the original-cased text (e.g., "Shai Gilgeous-Alexander")
-        proper_phrases = re.findall(r'\b([A-Z][a-zA-Z0-9\-]{2,}(?:\s+[A-Z][a-zA-Z0-9\-]{2,})*)\b', text)
+        proper_phrases = _rc(r'\b([A-Z][a-zA-Z0-9\-]{2,}(?:\s+[A-Z][a-zA-Z0-9\-]{2,})*)\b').findall(text)
         for pp in proper_phrases:
             pp_clean = pp.strip()
             pp_lower = pp_clean.lower()
@@ -390,7 +420,7 @@ class BaseAgent:
             return []
 
         relevance_keywords = relevance_keywords or []
-        sentences = re.split(r'(?<=[.!?])\s+', content[:5000])
+        sentences = _rc(r'(?<=[.!?])\s+').split(content[:5000])
         scored = []
 
         for sent in sentences:
@@ -404,11 +434,11 @@ class BaseAgent:
                 if kw and kw.lower() in s.lower():
                     score += 5
             # prefer sentences with dates, numbers, proper nouns
-            if re.search(r'\b(19|20)\d{2}\b', s):
+            if _rc(r'\b(19|20)\d{2}\b').search(s):
                 score += 3
-            if re.search(r'\b\d+%|\$\d+|\d+\b', s):
+            if _rc(r'\b\d+%|\$\d+|\d+\b').search(s):
                 score += 2
-            if re.search(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\b', s):
+            if _rc(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+\b').search(s):
                 score += 1
             # baseline length weight
             score += min(3, len(s) // 120)
@@ -455,11 +485,16 @@ class BaseAgent:
         fact_summary += "█"*60 + "\n\n"
 
         total_fact_count = 0
+        # mirrored/syndicated pages often return identical content; extract once
+        extracted_by_content: dict[str, list[str]] = {}
         for i, (result, content) in enumerate(results[:6], 1):
             title = result.get("title", "Untitled")
             link = result.get("link", "Unknown")
             fact_summary += f"--- WEB RESULT {i}: {title} ({link}) ---\n"
-            extracted = self._smart_extract_facts(content, max_facts=4, relevance_keywords=relevance_keywords)
+            extracted = extracted_by_content.get(content)
+            if extracted is None:
+                extracted = self._smart_extract_facts(content, max_facts=4, relevance_keywords=relevance_keywords)
+                extracted_by_content[content] = extracted
             if not extracted:
                 fact_summary += "  (no strong facts automatically extracted)\n\n"
                 continue
@@ -1235,7 +1270,7 @@ class BaseAgent:
 
         ret = self._extract_response_content(raw_response)
 
-        if not include_thinking_block:
+        if not include_thinking_block and _THINK_END in ret:
             ret = self._remove_thinking_block(ret)
 
         return ret
@@ -1263,9 +1298,9 @@ class BaseAgent:
 
     def _remove_thinking_block(self, content: str) -> str:
         """Remove thinking block from response content."""
-        think_end = content.find("</think>")
+        think_end = content.find(_THINK_END)
         if think_end != -1:
-            return content[think_end + len("</think>") :].strip()
+            return content[think_end + _THINK_END_LEN :].strip()
         return content
 
     def _display_chunk(self, chunk: BaseMessage | dict):
@@ -1305,6 +1340,58 @@ class BaseAgent:
         """Handle tool message display."""
         self.ui.tool_output(message.name, message.content)
 
+    def _stream_in_background(self, payload: dict, config: dict):
+        """Yield agent stream chunks produced on a daemon thread.
+
+        Decouples the LLM stream from UI rendering: the producer keeps pulling
+        chunks into a bounded queue while the caller displays them. Exceptions
+        raised by the stream are re-raised in the consuming thread. If the
+        caller stops early, the producer stops too and closes the LLM stream.
+        """
+        q = queue.Queue(maxsize=_STREAM_QUEUE_SIZE)
+        error: list[BaseException] = []
+        stopped = threading.Event()
+
+        def _put(item) -> bool:
+            """Queue an item, giving up once the consumer has stopped."""
+            while not stopped.is_set():
+                try:
+                    q.put(item, timeout=_STREAM_PUT_TIMEOUT)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _pull():
+            stream = None
+            try:
+                stream = self.agent.stream(payload, config=config)
+                for c in stream:
+                    if not _put(c):
+                        break
+            except BaseException as e:
+                error.append(e)
+            finally:
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    try:
+                        close()
+                    except Exception:
+                        pass
+                _put(_STREAM_DONE)
+
+        threading.Thread(target=_pull, daemon=True).start()
+        try:
+            while True:
+                chunk = q.get()
+                if chunk is _STREAM_DONE:
+                    break
+                yield chunk
+        finally:
+            stopped.set()
+        if error:
+            raise error[0]
+
     def ask_once(self, user_input: str, thread_id: str = None, active_dir: str = None, stream: bool = False, return_meta: bool = False, on_partial: callable = None):
         """Run a single-turn prompt and return the assistant response as a string.
 
@@ -1324,7 +1411,7 @@ class BaseAgent:
 
         try:
             first_partial_sent = False
-            for chunk in self.agent.stream({"messages": [("human", user_input)]}, config=self.configuration):
+            for chunk in self._stream_in_background({"messages": [("human", user_input)]}, self.configuration):
                 # reuse existing display/accumulation logic
                 try:
                     self._display_chunk(chunk)
@@ -1358,7 +1445,8 @@ class BaseAgent:
             duration_ms = int((end - start) * 1000)
 
             response = self._current_response.strip()
-            response = self._remove_thinking_block(response)
+            if _THINK_END in response:
+                response = self._remove_thinking_block(response)
 
             meta = {
                 "model": getattr(self, "model_name", None),
@@ -85,10 +85,10 @@ class AgentUI:
             for k, v in args.items():
 
                 value_str = str(v)
-                if len(value_str) > 100 or "\n" in value_str:
-                    content_parts.append(
-                        f"- **{k}:**\n```\n{value_str[:500]}{'...' if len(value_str) > 500 else ''}\n```"
-                    )
+                n = len(value_str)
+                if n > 100 or "\n" in value_str:
+                    head = value_str if n <= 500 else value_str[:500] + "..."
+                    content_parts.append(f"- **{k}:**\n```\n{head}\n```")
                 else:
                     content_parts.append(f"- **{k}:** `{value_str}`")
 
@@ -224,38 +224,43 @@ class AgentUI:
             )
             return default
 
-    def get_key(self):
-        """Read a single key press and return a string identifier."""
-        if os.name == "nt":
+    def _get_key_nt(self):
+        """Read a single key press on Windows and return a string identifier."""
+        key = msvcrt.getch()
+        if key == b"\xe0":  # Special keys (arrows, F keys, etc.)
             key = msvcrt.getch()
-            if key == b"\xe0":  # Special keys (arrows, F keys, etc.)
-                key = msvcrt.getch()
-                return {
-                    b"H": "UP",
-                    b"P": "DOWN",
-                }.get(key, None)
-            elif key in (b"\r", b"\n"):
+            return {
+                b"H": "UP",
+                b"P": "DOWN",
+            }.get(key, None)
+        elif key in (b"\r", b"\n"):
+            return "ENTER"
+        return None
+
+    def _get_key_posix(self):
+        """Read a single key press on POSIX and return a string identifier."""
+        fd = sys.stdin.fileno()
+        old_settings = termios.tcgetattr(fd)
+        try:
+            tty.setraw(fd)
+            ch1 = sys.stdin.read(1)
+            if ch1 == "\x1b":  # Escape sequence
+                ch2 = sys.stdin.read(1)
+                if ch2 == "[":
+                    ch3 = sys.stdin.read(1)
+                    return {
+                        "A": "UP",
+                        "B": "DOWN",
+                    }.get(ch3, None)
+            elif ch1 in ("\r", "\n"):
                 return "ENTER"
-        else:
-            fd = sys.stdin.fileno()
-            old_settings = termios.tcgetattr(fd)
-            try:
-                tty.setraw(fd)
-                ch1 = sys.stdin.read(1)
-                if ch1 == "\x1b":  # Escape sequence
-                    ch2 = sys.stdin.read(1)
-                    if ch2 == "[":
-                        ch3 = sys.stdin.read(1)
-                        return {
-                            "A": "UP",
-                            "B": "DOWN",
-                        }.get(ch3, None)
-                elif ch1 in ("\r", "\n"):
-                    return "ENTER"
-            finally:
-                termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
         return None
 
+    # Pick the platform implementation once instead of branching per keystroke
+    get_key = _get_key_nt if os.name == "nt" else _get_key_posix
+
     def select_option(self, message: str, options: list[str]) -> int:
         idx = 0
         self.console.print(f"\n{message}")
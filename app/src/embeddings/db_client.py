@@ -1,5 +1,7 @@
-from app.utils.constants import CHUNK_SIZE, CHUNK_OVERLAP, DEFAULT_PATHS, MAX_RESULTS, BATCH_SIZE
+from app.utils.constants import CHUNK_SIZE, CHUNK_OVERLAP, DEFAULT_PATHS, MAX_RESULTS, BATCH_SIZE, EMBED_WORKERS, SCRAPE_WORKERS
+from app.utils.constants import HNSW_M, HNSW_EF_CONSTRUCTION, HNSW_EF_SEARCH
 from app.src.embeddings.scrapers.abstract_scraper import Scraper
+from app.src.embeddings.embedding_functions.ollama_embed import sanitize_input
 from app.src.helpers.valid_dir import validate_dir_name
 from app.src.embeddings.rag_errors import DBAccessError, ScrapingFailedError
 from app.src.core.ui import default_ui
@@ -7,11 +9,34 @@ from app.utils.ui_messages import UI_MESSAGES
 from typing import Callable, Any
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from heapq import nsmallest
+from operator import itemgetter
+import atexit
 import json
 import os
 import time
 from requests.exceptions import HTTPError
 
+# orjson is optional: use it for indexed_collections.json when installed
+try:
+    import orjson
+
+    def _json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+except ImportError:
+
+    def _json_loads(data: bytes) -> Any:
+        return json.loads(data)
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
+
 
 # configure database path
 DB_PATH = ""
@@ -29,6 +54,59 @@ if not DB_PATH:
         DB_PATH = Path(os.path.expanduser(DB_PATH))
 
 
+# Verbose ingestion tracing: when set (1/true) print per-file/per-batch DEBUG panels.
+VERBOSE = os.environ.get("ALLY_VERBOSE", "0").lower() in ("1", "true", "yes")
+
+
+def _debug(message: str) -> None:
+    """Show a DEBUG status panel only when verbose tracing is enabled."""
+    if VERBOSE:
+        default_ui.status_message(title="DEBUG", message=message, style="info")
+
+
+def _enable_sqlite_wal(sqlite_path: Path) -> None:
+    """Switch Chroma's SQLite file to WAL journaling before Chroma opens it.
+
+    journal_mode=WAL is stored in the database file, so it applies to Chroma's
+    own connections: commits append to the log instead of rewriting the
+    rollback journal, and readers no longer block the ingestion writer.
+    """
+    import sqlite3
+
+    try:
+        conn = sqlite3.connect(sqlite_path)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass  # best effort; Chroma works with the default journal
+
+
+def _iter_files(root: str):
+    """Recursively yield file DirEntry objects under root without following dir symlinks.
+
+    Files are yielded as the directory is read; subdirectories are walked
+    once its scandir handle is closed, so only one directory is open at a time.
+    """
+    subdirs = []
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        yield entry
+                except OSError:
+                    continue
+    except OSError:
+        return  # unreadable directory, same as os.walk's default behaviour
+
+    for path in subdirs:
+        yield from _iter_files(path)
+
+
 class DataBaseClient:
     _instance = None
     _initialized = False
@@ -73,11 +151,18 @@ class DataBaseClient:
             from chromadb.config import Settings
 
         os.makedirs(DB_PATH, exist_ok=True)
+        _enable_sqlite_wal(DB_PATH / "chroma.sqlite3")
 
         self.db_client = chromadb.PersistentClient(
             path=DB_PATH, settings=Settings(anonymized_telemetry=False)
         )
         self.embedding_function = embedding_function
+        # One long-lived pool for embedding batches, so worker threads (and the
+        # keep-alive connections an embedder holds per thread) outlive each document
+        self._embed_pool = ThreadPoolExecutor(
+            max_workers=self._embed_workers(embedding_function),
+            thread_name_prefix="embed",
+        )
 
         self.scraper = scraper
 
@@ -88,6 +173,24 @@ class DataBaseClient:
             self.indexed_collections_path.write_text("{}")
 
         self.indexed_collections: dict[str, bool] = self._load_indexed_collections()
+        self._refresh_active_collections()
+        # unsaved changes to indexed_collections, flushed at the latest on exit
+        self._dirty = False
+        atexit.register(self._save_indexed_collections)
+
+        # collection handles by name, so repeated lookups skip Chroma's dispatcher
+        self._collections: dict[str, Any] = {}
+
+    @staticmethod
+    def _embed_workers(embedding_function: Callable | None) -> int:
+        """Number of batches to embed at once for this embedding function.
+
+        Embedders that can't run batches concurrently (e.g. local models)
+        declare a lower `max_concurrent_batches` on their class.
+        """
+        embedder = getattr(embedding_function, "__self__", None)
+        limit = getattr(embedder, "max_concurrent_batches", EMBED_WORKERS)
+        return max(1, min(EMBED_WORKERS, limit))
 
     @staticmethod
     def get_instance() -> "DataBaseClient":
@@ -96,6 +199,31 @@ class DataBaseClient:
             return None
         return DataBaseClient._instance
 
+    def _get_collection(self, collection_name: str, create: bool = False):
+        """Return a cached collection handle, fetching (or creating) it on first use."""
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            import chromadb.errors as chromadb_errors
+
+            try:
+                collection = self.db_client.get_collection(name=collection_name)
+            except chromadb_errors.NotFoundError:
+                if not create:
+                    raise
+                # HNSW parameters can only be set when the index is built;
+                # the distance space stays at Chroma's default so scores
+                # remain comparable with existing collections
+                collection = self.db_client.create_collection(
+                    name=collection_name,
+                    metadata={
+                        "hnsw:M": HNSW_M,
+                        "hnsw:construction_ef": HNSW_EF_CONSTRUCTION,
+                        "hnsw:search_ef": HNSW_EF_SEARCH,
+                    },
+                )
+            self._collections[collection_name] = collection
+        return collection
+
     def _ensure_db_directory_exists(self) -> None:
         """Ensure the database directory exists."""
         try:
@@ -109,38 +237,133 @@ class DataBaseClient:
     def _load_indexed_collections(self) -> dict[str, bool]:
         """Load indexed collections from the JSON file."""
         try:
-            with open(self.indexed_collections_path, "r") as f:
-                return json.load(f)
+            with open(self.indexed_collections_path, "rb") as f:
+                return _json_loads(f.read())
         except (json.JSONDecodeError, FileNotFoundError):
             return {}
 
     def _save_indexed_collections(self) -> None:
-        """Save indexed collections to the JSON file."""
+        """Save indexed collections to the JSON file if they changed since the last save."""
+        if not self._dirty:
+            return
         try:
             # Ensure the database directory exists before writing
             self._ensure_db_directory_exists()
-            with open(self.indexed_collections_path, "w") as f:
-                json.dump(self.indexed_collections, f, indent=2)
+            # write to a temp file and swap it in so a crash never leaves a torn file
+            tmp_path = self.indexed_collections_path.with_suffix(".json.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(_json_dumps(self.indexed_collections))
+            os.replace(tmp_path, self.indexed_collections_path)
+            self._dirty = False
         except Exception as e:
             default_ui.error(UI_MESSAGES["errors"]["failed_save_indexed"].format(e))
 
+    def _mark_collections_changed(self) -> None:
+        """Record a change to indexed_collections that still needs saving."""
+        self._dirty = True
+        self._refresh_active_collections()
+
+    def _refresh_active_collections(self) -> None:
+        """Rebuild the list of collection names that queries should search."""
+        self._active_collections: list[str] = [
+            name.strip() for name, indexed in self.indexed_collections.items() if indexed
+        ]
+
+    def has_active_collections(self) -> bool:
+        """Whether any indexed collection would be searched by a query."""
+        return bool(self._active_collections)
+
     def index_collection(self, collection_name: str) -> None:
         """Mark a collection as indexed."""
         self.indexed_collections[collection_name] = True
+        self._mark_collections_changed()
         self._save_indexed_collections()
 
     def unindex_collection(self, collection_name: str) -> None:
         """Mark a collection as unindexed."""
         if collection_name in self.indexed_collections:
             self.indexed_collections[collection_name] = False
+            self._mark_collections_changed()
             self._save_indexed_collections()
 
-    def already_stored(self, file_path: str, collection_name: str) -> bool:
+    def _prefetch_existing(self, collection_name: str) -> dict[str, tuple[str, str]]:
+        """Map every stored file_path in a collection to its (hash, mod_date)."""
+        import chromadb.errors as chromadb_errors
+
+        try:
+            collection = self._get_collection(collection_name)
+
+        except chromadb_errors.NotFoundError:
+            return {}
+
+        except Exception:
+            raise DBAccessError()
+
+        existing = {}
+        page_size = 10000
+        offset = 0
+        try:
+            # chunks share their document's metadata, so page through them once
+            while True:
+                results = collection.get(
+                    include=["metadatas"], limit=page_size, offset=offset
+                )
+                metadatas = results["metadatas"]
+                for meta in metadatas:
+                    if meta and "file_path" in meta:
+                        existing[meta["file_path"]] = (meta.get("hash"), meta.get("mod_date"))
+                if len(metadatas) < page_size:
+                    break
+                offset += page_size
+
+        except Exception:
+            raise DBAccessError()
+
+        return existing
+
+    def _existing_for_file(
+        self, file_path: str, collection_name: str
+    ) -> dict[str, tuple[str, str]]:
+        """Look up one file's stored (hash, mod_date), in the same shape as `_prefetch_existing`."""
+        import chromadb.errors as chromadb_errors
+
+        try:
+            collection = self._get_collection(collection_name)
+
+        except chromadb_errors.NotFoundError:
+            return {}
+
+        except Exception:
+            raise DBAccessError()
+
+        try:
+            results = collection.get(
+                where={"file_path": file_path},
+                limit=1,
+                include=["metadatas"],
+            )
+        except Exception:
+            raise DBAccessError()
+
+        if not results["metadatas"]:
+            return {}
+        meta = results["metadatas"][0]
+        return {file_path: (meta.get("hash"), meta.get("mod_date"))}
+
+    def already_stored(
+        self,
+        file_path: str,
+        collection_name: str,
+        existing: dict[str, tuple[str, str]] | None = None,
+    ) -> bool:
         """Check if a document is already stored in the database."""
         import chromadb.errors as chromadb_errors
 
+        if existing is not None:
+            return file_path in existing
+
         try:
-            collection = self.db_client.get_collection(name=collection_name)
+            collection = self._get_collection(collection_name)
 
         except chromadb_errors.NotFoundError:
             return False
@@ -158,176 +381,193 @@ class DataBaseClient:
         except Exception:
             raise DBAccessError()
 
-    def store_document(self, file_path: str, collection_name: str) -> None:
-        """Store document content and metadata in ChromaDB."""
-        default_ui.status_message(
-            title="DEBUG",
-            message=f"store_document called for: {file_path}",
-            style="info"
-        )
-        
-        if self.already_stored(file_path, collection_name):
-            default_ui.status_message(
-                title="DEBUG",
-                message=f"File already stored, skipping",
-                style="info"
+    def hash_stored(
+        self,
+        file_hash: str,
+        collection_name: str,
+        stored_hashes: set[str] | None = None,
+    ) -> bool:
+        """Check if a document with the same content hash is already stored."""
+        import chromadb.errors as chromadb_errors
+
+        if stored_hashes is not None:
+            return file_hash in stored_hashes
+
+        try:
+            collection = self._get_collection(collection_name)
+
+        except chromadb_errors.NotFoundError:
+            return False
+
+        except Exception:
+            raise DBAccessError()
+
+        try:
+            results = collection.get(
+                where={"hash": file_hash},
+                limit=1,
+                include=["metadatas"],
             )
+            return bool(results["metadatas"])
+
+        except Exception:
+            raise DBAccessError()
+
+    def store_document(
+        self,
+        file_path: str,
+        collection_name: str,
+        existing: dict[str, tuple[str, str]] | None = None,
+        response: dict | None = None,
+        stored_hashes: set[str] | None = None,
+    ) -> None:
+        """Store document content and metadata in ChromaDB.
+
+        `response` may carry an already scraped result to skip scraping here, and
+        `stored_hashes` the content hashes already in the collection.
+        """
+        _debug(f"store_document called for: {file_path}")
+        
+        if self.already_stored(file_path, collection_name, existing):
+            _debug(f"File already stored, skipping")
             return
 
-        default_ui.status_message(
-            title="DEBUG",
-            message=f"Starting scrape operation",
-            style="info"
-        )
-        response = self.scraper.scrape(file_path)
+        if response is None:
+            _debug(f"Starting scrape operation")
+            response = self.scraper.scrape(file_path)
         
-        default_ui.status_message(
-            title="DEBUG",
-            message=f"Scrape completed, got {len(response.get('content', ''))} chars",
-            style="info"
-        )
+        _debug(f"Scrape completed, got {len(response.get('content', ''))} chars")
         
         content = response["content"]
         metadata = response["metadata"]
 
-        chunks = [
-            content[i : i + CHUNK_SIZE]
-            for i in range(0, len(content), CHUNK_SIZE - CHUNK_OVERLAP)
-            if content[i : i + CHUNK_SIZE].strip()  # Filter empty chunks before embedding
-        ]
+        # identical content under another path: its chunks are already embedded
+        # (chunk ids derive from the hash), so skip the embedding work entirely
+        if self.hash_stored(metadata["hash"], collection_name, stored_hashes):
+            _debug(f"Same content already stored, skipping")
+            return
 
-        default_ui.status_message(
-            title="DEBUG",
-            message=f"Created {len(chunks)} chunks",
-            style="info"
-        )
+        # Drop chunks with nothing to embed (blank or only control characters)
+        # using the embedder's own sanitizer, so every submitted chunk gets a vector
+        chunks = []
+        for i in range(0, len(content), CHUNK_SIZE - CHUNK_OVERLAP):
+            chunk = content[i : i + CHUNK_SIZE]
+            if sanitize_input(chunk):
+                chunks.append(chunk)
+
+        _debug(f"Created {len(chunks)} chunks")
 
         if collection_name not in self.indexed_collections:
             self.indexed_collections[collection_name] = True  # default to indexed
-            self._save_indexed_collections()
+            # persisted once store_documents finishes (or at exit)
+            self._mark_collections_changed()
 
-        collection = self.db_client.get_or_create_collection(
-            name=collection_name,
-        )
+        collection = self._get_collection(collection_name, create=True)
 
-        embeddings = []
-        
+        import numpy as np  # installed alongside chromadb, which may be lazy-installed
+
+        # Embedding is network/GPU bound, so batches are embedded concurrently
+        # and written back by start offset to keep them aligned with chunks.
+        # Vectors are packed into one float32 matrix (Chroma's storage type) as
+        # batches arrive instead of holding lists of Python floats.
+        embeddings = None
+
+        futures = {}
         for i in range(0, len(chunks), BATCH_SIZE):
             batch_chunks = chunks[i : i + BATCH_SIZE]
             batch_num = i // BATCH_SIZE + 1
-            
-            default_ui.status_message(
-                title="DEBUG",
-                message=f"Embedding batch {batch_num} ({len(batch_chunks)} chunks)",
-                style="info"
-            )
-            
+
+            _debug(f"Embedding batch {batch_num} ({len(batch_chunks)} chunks)")
+
             # Let OllamaEmbedder handle retries - don't catch exceptions here
             # The embedder has proper retry logic with backoff
-            batch_embeddings = self.embedding_function(batch_chunks)
-            embeddings.extend(batch_embeddings)
+            futures[self._embed_pool.submit(self.embedding_function, batch_chunks)] = (
+                i,
+                len(batch_chunks),
+            )
 
-        default_ui.status_message(
-            title="DEBUG",
-            message=f"All embeddings generated ({len(embeddings)} total), writing to database",
-            style="info"
-        )
+        try:
+            for future in as_completed(futures):
+                i, batch_len = futures[future]
+                batch_embeddings = np.asarray(future.result(), dtype=np.float32)
+                # vectors are matched to chunks by position, so a short batch
+                # would shift them onto the wrong chunks
+                if len(batch_embeddings) != batch_len:
+                    raise ValueError(
+                        f"Embedding function returned {len(batch_embeddings)} vectors "
+                        f"for {batch_len} chunks"
+                    )
+                if embeddings is None:
+                    embeddings = np.empty(
+                        (len(chunks), batch_embeddings.shape[1]), dtype=np.float32
+                    )
+                embeddings[i : i + len(batch_embeddings)] = batch_embeddings
+        except BaseException:
+            # the pool is shared, so don't leave this document's batches queued
+            for future in futures:
+                future.cancel()
+            raise
+
+        if embeddings is None:  # no chunks to embed
+            embeddings = np.empty((0, 0), dtype=np.float32)
 
-        # Write to database in smaller batches to avoid blocking
-        # ChromaDB can struggle with very large add() calls
-        write_batch_size = 50
+        _debug(f"All embeddings generated ({len(embeddings)} total), writing to database")
+
+        # Write the whole document in one add() (one SQLite transaction, one
+        # HNSW insert); only split when it exceeds Chroma's max batch size
+        ids = [f"{metadata['hash']}_{i}" for i in range(len(chunks))]
+        metadatas = [metadata] * len(chunks)
+        write_batch_size = self.db_client.get_max_batch_size()
         for batch_idx in range(0, len(chunks), write_batch_size):
-            batch_end = min(batch_idx + write_batch_size, len(chunks))
-            batch_chunks = chunks[batch_idx:batch_end]
-            batch_embeddings = embeddings[batch_idx:batch_end]
-            batch_ids = [f"{metadata['hash']}_{i}" for i in range(batch_idx, batch_end)]
-            
+            batch_end = batch_idx + write_batch_size
+
             try:
-                default_ui.status_message(
-                    title="DEBUG",
-                    message=f"Writing chunk batch {batch_idx//write_batch_size + 1} ({len(batch_chunks)} chunks)",
-                    style="info"
-                )
-                
                 collection.add(
-                    documents=batch_chunks,
-                    metadatas=[metadata] * len(batch_chunks),
-                    embeddings=batch_embeddings,
-                    ids=batch_ids,
-                )
-                
-                default_ui.status_message(
-                    title="DEBUG",
-                    message=f"Chunk batch {batch_idx//write_batch_size + 1} written successfully",
-                    style="info"
+                    documents=chunks[batch_idx:batch_end],
+                    metadatas=metadatas[batch_idx:batch_end],
+                    embeddings=embeddings[batch_idx:batch_end],
+                    ids=ids[batch_idx:batch_end],
                 )
             except Exception as e:
                 default_ui.error(f"Failed to write chunk batch: {e}")
                 raise
 
-        default_ui.status_message(
-            title="DEBUG",
-            message=f"Document stored successfully",
-            style="info"
-        )
-        
-        # Force ChromaDB to persist this document immediately
-        # This prevents rollback if subsequent documents fail
-        try:
-            self.db_client._client._persist_directory
-            default_ui.status_message(
-                title="DEBUG",
-                message=f"Document persisted to disk",
-                style="info"
-            )
-        except:
-            pass  # PersistentClient auto-persists
-
-    def was_modified(self, file_path: str, collection_name: str) -> bool:
-        """Check if the file has been modified by comparing hashes and modification dates."""
-        import chromadb.errors as chromadb_errors
-
-        last_hash = self.scraper.get_hash(file_path)
-        last_mod_date = datetime.fromtimestamp(
-            Path(file_path).stat().st_mtime
-        ).isoformat()
+        # PersistentClient commits each add(), so the document is already on disk
+        _debug(f"Document stored successfully")
+
+    def was_modified(
+        self,
+        file_path: str | os.DirEntry,
+        collection_name: str,
+        existing: dict[str, tuple[str, str]] | None = None,
+    ) -> bool:
+        """Check if the file has been modified by comparing modification dates, then hashes.
+
+        Accepts a DirEntry from a directory scan so its stat result is reused, and
+        an optional `existing` map from `_prefetch_existing` to skip the Chroma query.
+        """
+        if isinstance(file_path, os.DirEntry):
+            st_mtime = file_path.stat().st_mtime
+            file_path = file_path.path
+        else:
+            st_mtime = Path(file_path).stat().st_mtime
+        last_mod_date = datetime.fromtimestamp(st_mtime).isoformat()
 
-        try:
-            collection = self.db_client.get_collection(name=collection_name)
+        if existing is None:
+            existing = self._existing_for_file(file_path, collection_name)
 
-        except chromadb_errors.NotFoundError:
+        if file_path not in existing:  # File not found in collection, consider it as modified (new file)
             return True
+        stored_hash, stored_mod_date = existing[file_path]
 
-        except Exception:
-            raise DBAccessError()
-
-        try:
-            # get documents by metadata hash to find any document with the same file path
-            results = collection.get(
-                where={"file_path": file_path},
-                limit=1,
-            )
-            if not results[
-                "metadatas"
-            ]:  # File not found in collection, consider it as modified (new file)
-                return True
-
-            stored_hash, stored_mod_date = (
-                results["metadatas"][0].get("hash") if results["metadatas"] else None,
-                (
-                    results["metadatas"][0].get("mod_date")
-                    if results["metadatas"]
-                    else None
-                ),
-            )
-
-            if stored_hash is None or stored_mod_date is None:
-                return True
+        if stored_hash is None or stored_mod_date is None:
+            return True
 
-        except Exception:
-            raise DBAccessError()
+        # unchanged mtime is the common case on a rescan: skip reading the file
+        if last_mod_date == stored_mod_date:
+            return False
 
-        return last_hash != stored_hash or last_mod_date != stored_mod_date
+        return self.scraper.get_hash(file_path) != stored_hash
 
     def store_documents(self, directory_path: str, collection_name: str) -> None:
         """Store all documents from a directory into the database."""
@@ -349,22 +589,16 @@ class DataBaseClient:
         directory_path = directory_path.resolve()
         directory_path = str(directory_path)
 
-        default_ui.status_message(
-            title="DEBUG",
-            message=f"Starting embedding for: {directory_path}",
-            style="info"
-        )
+        _debug(f"Starting embedding for: {directory_path}")
 
         # If it's a file, just process that single file
         if os.path.isfile(directory_path):
-            default_ui.status_message(
-                title="DEBUG",
-                message=f"Processing single file: {directory_path}",
-                style="info"
-            )
+            _debug(f"Processing single file: {directory_path}")
             try:
-                if self.was_modified(directory_path, collection_name):
-                    self.store_document(directory_path, collection_name)
+                # one metadata query answers both the modified and the stored check
+                existing = self._existing_for_file(directory_path, collection_name)
+                if self.was_modified(directory_path, collection_name, existing):
+                    self.store_document(directory_path, collection_name, existing)
 
             except ScrapingFailedError:
                 default_ui.error(
@@ -374,52 +608,72 @@ class DataBaseClient:
             except:
                 raise
 
+            # a single file never needs the collection-wide scan or the walk below
+            self._save_indexed_collections()
+            self._report_embedded(directory_path, collection_name)
+            return
+
         if not os.path.exists(directory_path):
             default_ui.error(
                 UI_MESSAGES["errors"]["directory_not_exist"].format(directory_path)
             )
             return
 
-        default_ui.status_message(
-            title="DEBUG",
-            message=f"Found directory, starting file walk",
-            style="info"
-        )
+        _debug(f"Found directory, starting file walk")
 
-        for root, _, files in os.walk(directory_path):
-            default_ui.status_message(
-                title="DEBUG",
-                message=f"Processing folder: {root} ({len(files)} files)",
-                style="info"
-            )
-            for file in files:
-                file_path = os.path.join(root, file)
-                default_ui.status_message(
-                    title="DEBUG",
-                    message=f"Checking file: {file}",
-                    style="info"
+        # one metadata scan up front instead of two queries per file
+        existing = self._prefetch_existing(collection_name)
+        stored_hashes = {file_hash for file_hash, _ in existing.values()}
+
+        def _store_scraped(file_path: str, future) -> None:
+            file = os.path.basename(file_path)
+            try:
+                # files the scraper can't handle on a worker thread (future is
+                # None) are scraped here, on the calling thread
+                if future is None:
+                    response = self.scraper.scrape(file_path)
+                else:
+                    response = future.result()
+                self.store_document(
+                    file_path,
+                    collection_name,
+                    existing,
+                    response=response,
+                    stored_hashes=stored_hashes,
                 )
+                # later copies in this run are deduplicated too
+                stored_hashes.add(response["metadata"]["hash"])
+
+            except ScrapingFailedError:
+                default_ui.error(
+                    UI_MESSAGES["errors"]["failed_scrape"].format(file_path)
+                )
+
+            except Exception as e:
+                default_ui.error(f"Error processing {file}: {str(e)}")
+                # Continue with next file instead of stopping entire process
+                default_ui.warning(f"Skipping {file} and continuing with remaining files...")
+
+        # Scrape upcoming files on worker threads while the current one is
+        # embedded and written; Chroma writes stay on this thread
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=SCRAPE_WORKERS) as scrape_pool:
+            for entry in _iter_files(directory_path):
+                file_path = entry.path
+                file = entry.name
+                _debug(f"Checking file: {file}")
                 try:
-                    if self.was_modified(file_path, collection_name):
-                        default_ui.status_message(
-                            title="DEBUG",
-                            message=f"Embedding: {file}",
-                            style="info"
-                        )
-                        self.store_document(file_path, collection_name)
+                    if self.was_modified(
+                        entry, collection_name, existing
+                    ) and not self.already_stored(file_path, collection_name, existing):
+                        _debug(f"Embedding: {file}")
+                        if self.scraper.scrape_concurrently(file_path):
+                            future = scrape_pool.submit(self.scraper.scrape, file_path)
+                        else:
+                            future = None
+                        pending.append((file_path, future))
                     else:
-                        default_ui.status_message(
-                            title="DEBUG",
-                            message=f"Skipped (not modified): {file}",
-                            style="info"
-                        )
-
-                except ScrapingFailedError:
-                    default_ui.error(
-                        UI_MESSAGES["errors"]["failed_scrape"].format(file_path)
-                    )
-                    # Continue with next file instead of stopping
-                    continue
+                        _debug(f"Skipped (not modified): {file}")
 
                 except Exception as e:
                     default_ui.error(f"Error processing {file}: {str(e)}")
@@ -427,6 +681,19 @@ class DataBaseClient:
                     default_ui.warning(f"Skipping {file} and continuing with remaining files...")
                     continue
 
+                # bound how far scraping runs ahead of embedding
+                if len(pending) > SCRAPE_WORKERS:
+                    _store_scraped(*pending.popleft())
+
+            while pending:
+                _store_scraped(*pending.popleft())
+
+        self._save_indexed_collections()
+        self._report_embedded(directory_path, collection_name)
+
+    @staticmethod
+    def _report_embedded(directory_path: str, collection_name: str) -> None:
+        """Show the success panel once an /embed run finishes."""
         default_ui.status_message(
             title=UI_MESSAGES["titles"]["info"],
             message=UI_MESSAGES["success"]["documents_embedded"].format(
@@ -446,10 +713,12 @@ class DataBaseClient:
             return
 
         try:
+            self._collections.pop(collection_name, None)
             self.db_client.delete_collection(name=collection_name)
             # Remove from indexed collections and save
             if collection_name in self.indexed_collections:
                 del self.indexed_collections[collection_name]
+                self._mark_collections_changed()
                 self._save_indexed_collections()
 
                 default_ui.status_message(
@@ -498,10 +767,12 @@ class DataBaseClient:
 
         try:
             collections = self.db_client.list_collections()
+            self._collections.clear()
             for col in collections:
                 self.db_client.delete_collection(name=col.name)
             # Clear indexed collections and save
             self.indexed_collections.clear()
+            self._mark_collections_changed()
             self._save_indexed_collections()
 
             default_ui.status_message(
@@ -514,41 +785,75 @@ class DataBaseClient:
             raise DBAccessError()
 
     def get_query_results(
-        self, query: str, n_results: int = MAX_RESULTS
+        self,
+        query: str,
+        n_results: int = MAX_RESULTS,
+        query_embedding: list[list[float]] | None = None,
     ) -> list[tuple[str, dict[str, Any]]]:
-        """Query the database and return relevant documents."""
+        """Query the database and return relevant documents.
+
+        `query_embedding` can be passed when the caller already embedded the query.
+        """
+        if not self._active_collections:
+            return []
+
+        # embed the query once and reuse the vector for every collection
+        if query_embedding is None:
+            try:
+                query_embedding = self.embedding_function([query])
+            except Exception:
+                raise DBAccessError()
+
         candidates = []
         # getting the closest documents across the given collections
-        for collection_name in self.indexed_collections.keys():
-            if not self.indexed_collections[collection_name]:
-                continue
-
+        for collection_name in self._active_collections:
             candidates.extend(
                 self.get_query_results_from_collection(
-                    query, collection_name.strip(), n_results
+                    query_embedding, collection_name, n_results
                 )
             )
 
-        # merging and sorting the results by distance
-        candidates.sort(key=lambda x: x[2])
-        # deduplicate by file hash
-        seen = set()
-        query_results = [
-            (doc, meta)
-            for doc, meta, _ in candidates
-            if meta.get("hash") not in seen and not seen.add(meta.get("hash"))
-        ][:n_results]
+        # merge by distance: partial-sort an oversampled top-k, since chunks
+        # from the same file collapse during dedup
+        top_k = n_results * 3
+        query_results = self._dedup_by_hash(
+            nsmallest(top_k, candidates, key=itemgetter(2)), n_results
+        )
+        if len(query_results) < n_results and len(candidates) > top_k:
+            # too many duplicates in the sample, fall back to a full sort
+            candidates.sort(key=itemgetter(2))
+            query_results = self._dedup_by_hash(candidates, n_results)
 
         return query_results
 
+    @staticmethod
+    def _dedup_by_hash(
+        candidates: list[tuple[str, dict[str, Any], float]], n_results: int
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """Keep the first result per file hash, stopping once we have enough."""
+        seen = set()
+        query_results = []
+        for doc, meta, _ in candidates:
+            file_hash = meta.get("hash")
+            if file_hash in seen:
+                continue
+            seen.add(file_hash)
+            query_results.append((doc, meta))
+            if len(query_results) == n_results:
+                break
+        return query_results
+
     def get_query_results_from_collection(
-        self, query: str, collection_name: str, n_results: int = MAX_RESULTS
+        self,
+        query_embedding: list[list[float]],
+        collection_name: str,
+        n_results: int = MAX_RESULTS,
     ) -> list[tuple[str, dict[str, Any], float]]:
-        """Query the database and return relevant documents."""
+        """Query one collection with a pre-computed query embedding and return relevant documents."""
         import chromadb.errors as chromadb_errors
 
         try:
-            collection = self.db_client.get_collection(name=collection_name)
+            collection = self._get_collection(collection_name)
 
         except chromadb_errors.NotFoundError:
             return []
@@ -558,7 +863,7 @@ class DataBaseClient:
 
         try:
             results = collection.query(
-                query_embeddings=self.embedding_function([query]),
+                query_embeddings=query_embedding,
                 n_results=n_results,
                 include=["documents", "metadatas", "distances"],
             )
@@ -28,6 +28,10 @@ if not EMBEDDING_MODEL_PATH:
 
 class HFEmbedder:
 
+    # The model is loaded on every call, so concurrent batches would each load
+    # their own copy; DataBaseClient embeds one batch at a time for this embedder
+    max_concurrent_batches = 1
+
     def __init__(self, model_name: str):
         self.model_name = model_name
 
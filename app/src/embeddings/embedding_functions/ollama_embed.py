@@ -1,41 +1,135 @@
-import ollama
+from urllib.parse import urlsplit, urlunsplit
+import http.client
+import threading
 import requests
+import socket
+import json
 import time
+import os
+import re
+
+# Control characters (including null bytes) mapped to spaces; \t \n \r are kept
+_CTRL_TABLE = {i: ' ' for i in range(32) if chr(i) not in '\n\r\t'}
+_WS_RE = re.compile(r'\s+')
+# Anything _sanitize_input would rewrite: control chars, non-space whitespace, runs of spaces
+_DIRTY_RE = re.compile(r'[\x00-\x1f]|[^\S ]|  ')
+# Extra seconds of request timeout per additional input in a batch; the base
+# timeout is sized for one input and Ollama embeds a batch in one request
+_TIMEOUT_PER_EXTRA_INPUT = 10
+
+
+def _ollama_base_url() -> str:
+    """Resolve the Ollama server URL the same way the ollama client does."""
+    host = os.environ.get("OLLAMA_HOST", "").strip().rstrip("/") or "localhost:11434"
+    if "://" not in host:
+        host = f"http://{host}"
+    url = urlsplit(host)
+    if url.port is None:
+        # like the ollama client: a host without a port means 11434 (443 for https)
+        port = 443 if url.scheme == "https" else 11434
+        url = url._replace(netloc=f"{url.netloc}:{port}")
+    return urlunsplit(url)
+
+
+def sanitize_input(text: str) -> str:
+    """Sanitize text before embedding; an empty result means there is nothing to embed."""
+    if not isinstance(text, str):
+        text = str(text)
+
+    # Already-clean text (e.g. PDF/eBook scraper output) skips the rewrite passes
+    if not _DIRTY_RE.search(text):
+        return text[:8000].strip()
+    
+    # Replace null bytes and other control characters except newlines/tabs
+    text = text.translate(_CTRL_TABLE)
+    
+    # Normalize whitespace
+    text = _WS_RE.sub(' ', text)
+    
+    # Limit to reasonable length (8000 chars = ~2000 tokens)
+    text = text[:8000].strip()
+    
+    return text
 
 
 class OllamaEmbedder:
     """Class to get embeddings using the Ollama API."""
     
-    def __init__(self, model_name: str = "nomic-embed-text:v1.5", timeout: int = 60, max_retries: int = 5) -> None:
+    def __init__(self, model_name: str = "nomic-embed-text:v1.5", timeout: int = 60, max_retries: int = 5, batch_size: int = 32) -> None:
         self.model_name = model_name
         self.timeout = timeout  # 60 second timeout per embedding call
         self.max_retries = max_retries  # 5 attempts with longer backoff
-        # Create client with explicit timeout
-        self.client = ollama.Client(timeout=timeout)
+        self.batch_size = batch_size  # max inputs sent in one /api/embed request
+        # One kept-open HTTP connection per thread (batches may be embedded
+        # concurrently); raw http.client skips the requests/urllib3 layers
+        url = urlsplit(_ollama_base_url())
+        self._conn_class = (
+            http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+        )
+        self._netloc = url.netloc
+        self._embed_path = f"{url.path}/api/embed"
+        self._local = threading.local()
+
+    def _get_conn(self) -> http.client.HTTPConnection:
+        """Return this thread's keep-alive connection, opening it if needed."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._conn_class(self._netloc, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _drop_conn(self) -> None:
+        """Close this thread's connection so the next request reconnects."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _embed(self, inputs: str | list[str]) -> list[list[float]]:
+        """Send one request to Ollama's /api/embed endpoint.
+
+        Transport failures are raised as the matching `requests` exceptions so
+        the retry ladder in `_embed_batch` handles them the same way.
+        """
+        body = json.dumps({"model": self.model_name, "input": inputs}).encode("utf-8")
+        timeout = self.timeout
+        if isinstance(inputs, list):
+            timeout += _TIMEOUT_PER_EXTRA_INPUT * (len(inputs) - 1)
+        # A kept-open socket may have been closed by the server or a proxy while
+        # idle; that is resent once on a fresh connection, not retried with backoff
+        for attempt in range(2):
+            conn = self._get_conn()
+            reused = conn.sock is not None
+            conn.timeout = timeout  # used when (re)connecting
+            if reused:
+                conn.sock.settimeout(timeout)
+            try:
+                conn.request("POST", self._embed_path, body, {"Content-Type": "application/json"})
+                response = conn.getresponse()
+                data = response.read()
+                break
+            except (socket.timeout, TimeoutError) as e:
+                self._drop_conn()
+                raise requests.exceptions.Timeout(e)
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError) as e:
+                self._drop_conn()
+                if reused and attempt == 0:
+                    continue
+                raise requests.exceptions.ConnectionError(e)
+            except (http.client.HTTPException, OSError) as e:
+                self._drop_conn()
+                raise requests.exceptions.ConnectionError(e)
+
+        if response.status >= 400:
+            raise requests.exceptions.HTTPError(
+                f"{response.status} {response.reason}: {data[:200].decode('utf-8', 'replace')}"
+            )
+        return json.loads(data)["embeddings"]
     
     @staticmethod
     def _sanitize_input(text: str) -> str:
         """Sanitize input text to prevent Ollama crashes."""
-        if not isinstance(text, str):
-            text = str(text)
-        
-        # Remove null bytes
-        text = text.replace('\x00', ' ')
-        
-        # Remove most control characters except newlines/tabs
-        text = ''.join(
-            c if ord(c) >= 32 or c in '\n\r\t' else ' '
-            for c in text
-        )
-        
-        # Normalize whitespace
-        import re
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Limit to reasonable length (8000 chars = ~2000 tokens)
-        text = text[:8000].strip()
-        
-        return text
+        return sanitize_input(text)
     
     def get_embeddings(self, sentences: list[str] | str) -> list[list[float]]:
         """
@@ -53,42 +147,50 @@ class OllamaEmbedder:
         else:
             sentences = [self._sanitize_input(s) for s in sentences]
         
-        # Filter out empty strings
-        sentences = [s for s in sentences if s]
-        if not sentences:
+        # Callers align vectors with their inputs by position, so an input that
+        # sanitizes to nothing fails the call instead of being dropped
+        if not all(sentences):
             raise ValueError("No non-empty content to embed after sanitization")
         
-        # Embed one sentence at a time to prevent Ollama from crashing
+        # Send sub-batches in a single request each; Ollama embeds the whole
+        # list in one forward pass
         embeddings = []
-        for i, sentence in enumerate(sentences, 1):
-            for attempt in range(self.max_retries):
-                try:
-                    response = self.client.embed(model=self.model_name, input=sentence)
-                    embeddings.append(response.embeddings[0])
-                    # Small delay between requests to let Ollama clean up resources
-                    # Increase delay to prevent resource exhaustion on Windows
-                    if i % 5 == 0:  # Every 5 requests (more frequent than before)
-                        time.sleep(0.2)  # Increased from 0.1s
-                    break  # Success, move to next sentence
-                except requests.exceptions.Timeout as e:
-                    if attempt < self.max_retries - 1:
-                        time.sleep(2 ** attempt)  # 1s, 2s, 4s backoff
-                    else:
-                        raise TimeoutError(f"Ollama embedding request timed out after {self.max_retries} attempts")
-                except (requests.exceptions.ConnectionError, ConnectionError) as e:
-                    if attempt < self.max_retries - 1:
-                        wait_time = 10 * (attempt + 1)  # 10s, 20s, 30s, 40s, 50s backoff - give Ollama time to restart
-                        time.sleep(wait_time)
-                    else:
-                        raise RuntimeError(f"Ollama connection failed after {self.max_retries} attempts: {e}")
-                except Exception as e:
-                    # Catch ResponseError and other exceptions from Ollama crashes
-                    # and retry with backoff
-                    if attempt < self.max_retries - 1:
-                        wait_time = 10 * (attempt + 1)  # 10s, 20s, 30s, 40s, 50s backoff - give Ollama time to restart
-                        time.sleep(wait_time)
-                    else:
-                        raise RuntimeError(f"Failed to get embeddings from Ollama after {self.max_retries} attempts: {e}")
-        
+        for i in range(0, len(sentences), self.batch_size):
+            embeddings.extend(self._embed_batch(sentences[i : i + self.batch_size]))
+
         return embeddings
 
+    def _embed_batch(self, batch: list[str]) -> list[list[float]]:
+        """Embed a batch, bisecting it when Ollama rejects the request."""
+        if len(batch) > 1:
+            try:
+                return self._embed(batch)
+            except requests.exceptions.HTTPError:
+                # One oversized chunk shouldn't fail the whole batch
+                mid = len(batch) // 2
+                return self._embed_batch(batch[:mid]) + self._embed_batch(batch[mid:])
+            except Exception:
+                pass  # fall through to the retry ladder below
+
+        for attempt in range(self.max_retries):
+            try:
+                return self._embed(batch)
+            except requests.exceptions.Timeout as e:
+                if attempt < self.max_retries - 1:
+                    time.sleep(2 ** attempt)  # 1s, 2s, 4s backoff
+                else:
+                    raise TimeoutError(f"Ollama embedding request timed out after {self.max_retries} attempts")
+            except (requests.exceptions.ConnectionError, ConnectionError) as e:
+                if attempt < self.max_retries - 1:
+                    wait_time = 10 * (attempt + 1)  # 10s, 20s, 30s, 40s, 50s backoff - give Ollama time to restart
+                    time.sleep(wait_time)
+                else:
+                    raise RuntimeError(f"Ollama connection failed after {self.max_retries} attempts: {e}")
+            except Exception as e:
+                # Catch HTTP errors and other exceptions from Ollama crashes
+                # and retry with backoff
+                if attempt < self.max_retries - 1:
+                    wait_time = 10 * (attempt + 1)  # 10s, 20s, 30s, 40s, 50s backoff - give Ollama time to restart
+                    time.sleep(wait_time)
+                else:
+                    raise RuntimeError(f"Failed to get embeddings from Ollama after {self.max_retries} attempts: {e}")
@@ -1,28 +1,49 @@
 from app.src.embeddings.db_client import DataBaseClient
+from app.src.embeddings.semantic_cache import SemanticCache
 from app.src.core.ui import default_ui
 from app.utils.ui_messages import UI_MESSAGES
 import os
 
+# Messages used by the handlers, resolved once at import
+_ERR_DB = UI_MESSAGES["errors"]["db_not_initialized"]
+_ERR_NAME_TOO_SHORT = UI_MESSAGES["errors"]["collection_name_too_short"]
+_MSG_INDEXED = UI_MESSAGES["success"]["collection_indexed"]
+_MSG_UNINDEXED = UI_MESSAGES["success"]["collection_unindexed"]
+_TITLE_INFO = UI_MESSAGES["titles"]["info"]
+_USAGE_DELETE = UI_MESSAGES["usage"]["delete"]
+_USAGE_EMBED = UI_MESSAGES["usage"]["embed"]
+_USAGE_INDEX = UI_MESSAGES["usage"]["index"]
+_USAGE_QUERY = UI_MESSAGES["usage"].get("query", "Usage: /query <search_text>")
+_USAGE_UNINDEX = UI_MESSAGES["usage"]["unindex"]
+
+# /query results for recent (near-)identical queries; cleared whenever the
+# stored or indexed documents change
+_query_cache = SemanticCache()
+
+
+def _require_db() -> DataBaseClient | None:
+    """Return the database client, reporting an error when it isn't initialized."""
+    db_client = DataBaseClient.get_instance()
+    if db_client is None:
+        default_ui.error(_ERR_DB)
+    return db_client
+
 
 def handle_embed_request(*args):
     """Handle the /embed command to embed documents from a specified directory."""
-    db_client = DataBaseClient.get_instance()
-
+    db_client = _require_db()
     if db_client is None:
-        default_ui.error(
-            UI_MESSAGES["errors"]["db_not_initialized"]
-        )
         return
 
     if len(args) < 2:
-        default_ui.error(UI_MESSAGES["usage"]["embed"])
+        default_ui.error(_USAGE_EMBED)
         return
 
     directory_path = args[0]
     collection_name = args[1]
     
     if len(collection_name) < 3:
-        default_ui.error(UI_MESSAGES["errors"]["collection_name_too_short"])
+        default_ui.error(_ERR_NAME_TOO_SHORT)
         return
 
     if directory_path == "." or directory_path == "./":
@@ -31,52 +52,47 @@ def handle_embed_request(*args):
     # Note: Not using 'with status()' context because it suppresses debug output and blocks stderr
     # The store_documents method includes its own status messages
     db_client.store_documents(directory_path, collection_name)
+    _query_cache.clear()
 
 
 def handle_index_request(*args):
     """Handle the /index command to toggle indexing for a specified collection."""
-    db_client = DataBaseClient.get_instance()
-
+    db_client = _require_db()
     if db_client is None:
-        default_ui.error(
-            UI_MESSAGES["errors"]["db_not_initialized"]
-        )
         return
 
     if len(args) < 1:
-        default_ui.error(UI_MESSAGES["usage"]["index"])
+        default_ui.error(_USAGE_INDEX)
         return
 
     collection_name = args[0]
 
     db_client.index_collection(collection_name)
+    _query_cache.clear()
     default_ui.status_message(
-        title=UI_MESSAGES["titles"]["info"],
-        message=UI_MESSAGES["success"]["collection_indexed"].format(collection_name),
+        title=_TITLE_INFO,
+        message=_MSG_INDEXED.format(collection_name),
         style="success",
     )
 
 
 def handle_unindex_request(*args):
     """Handle the /unindex command to toggle indexing for a specified collection."""
-    db_client = DataBaseClient.get_instance()
-
+    db_client = _require_db()
     if db_client is None:
-        default_ui.error(
-            UI_MESSAGES["errors"]["db_not_initialized"]
-        )
         return
 
     if len(args) < 1:
-        default_ui.error(UI_MESSAGES["usage"]["unindex"])
+        default_ui.error(_USAGE_UNINDEX)
         return
 
     collection_name = args[0]
 
     db_client.unindex_collection(collection_name)
+    _query_cache.clear()
     default_ui.status_message(
-        title=UI_MESSAGES["titles"]["info"],
-        message=UI_MESSAGES["success"]["collection_unindexed"].format(collection_name),
+        title=_TITLE_INFO,
+        message=_MSG_UNINDEXED.format(collection_name),
         style="success",
     )
 
@@ -86,12 +102,8 @@ def handle_list_command(*args):
     Handle the /list command which lists collections in the database and
     whether they are indexed or not.
     """
-    db_client = DataBaseClient.get_instance()
-    
+    db_client = _require_db()
     if db_client is None:
-        default_ui.error(
-            UI_MESSAGES["errors"]["db_not_initialized"]
-        )
         return
     
     db_client.list_collections()
@@ -99,54 +111,54 @@ def handle_list_command(*args):
 
 def handle_delete_command(*args):
     """Handles the deletion of a collection from the database by its name."""
-    db_client = DataBaseClient.get_instance()
-    
     if len(args) < 1:
-        default_ui.error(UI_MESSAGES["usage"]["delete"])
+        default_ui.error(_USAGE_DELETE)
         return
     
     collection_name = args[0]
     
+    db_client = _require_db()
     if db_client is None:
-        default_ui.error(
-            UI_MESSAGES["errors"]["db_not_initialized"]
-        )
         return
     
     db_client.delete_collection(collection_name=collection_name)
+    _query_cache.clear()
     
 
 def handle_purge_command():
     """Handles the purging of all collections from the database."""
-    db_client = DataBaseClient.get_instance()
-    
+    db_client = _require_db()
     if db_client is None:
-        default_ui.error(
-            UI_MESSAGES["errors"]["db_not_initialized"]
-        )
         return
     
     db_client.reset_database()
+    _query_cache.clear()
 
 
 def handle_query_command(*args):
     """Handle the /query command to search embeddings."""
-    db_client = DataBaseClient.get_instance()
-    
+    db_client = _require_db()
     if db_client is None:
-        default_ui.error(
-            UI_MESSAGES["errors"]["db_not_initialized"]
-        )
         return
     
     if len(args) < 1:
-        default_ui.error(UI_MESSAGES["usage"].get("query", "Usage: /query <search_text>"))
+        default_ui.error(_USAGE_QUERY)
         return
     
     query = " ".join(args)
     
     try:
-        results = db_client.get_query_results(query, n_results=5)
+        # with nothing indexed there is nothing to search, so skip embedding
+        # the query (and waiting on the embedder if it is down)
+        results = []
+        if db_client.has_active_collections():
+            query_embedding = db_client.embedding_function([query])
+            results = _query_cache.get(query_embedding[0])
+            if results is None:
+                results = db_client.get_query_results(
+                    query, n_results=5, query_embedding=query_embedding
+                )
+                _query_cache.put(query_embedding[0], results)
         
         if not results:
             default_ui.status_message(
@@ -157,13 +169,11 @@ def handle_query_command(*args):
             return
         
         # Format and display results
-        output = []
-        for i, (doc, meta) in enumerate(results, 1):
-            file_path = meta.get("file_path", "Unknown")
-            preview = doc[:150] + "..." if len(doc) > 150 else doc
-            output.append(f"\n**Result {i}:** {file_path}\n{preview}")
-        
-        message = "\n".join(output)
+        message = "\n".join(
+            f"\n**Result {i}:** {meta.get('file_path', 'Unknown')}\n"
+            f"{doc if len(doc) <= 150 else doc[:150] + '...'}"
+            for i, (doc, meta) in enumerate(results, 1)
+        )
         default_ui.status_message(
             title="Search Results",
             message=message,
@@ -175,12 +185,8 @@ def handle_query_command(*args):
 
 def handle_collections_command(*args):
     """Handle the /collections command to list collections."""
-    db_client = DataBaseClient.get_instance()
-    
+    db_client = _require_db()
     if db_client is None:
-        default_ui.error(
-            UI_MESSAGES["errors"]["db_not_initialized"]
-        )
         return
     
     db_client.list_collections()
@@ -188,36 +194,38 @@ def handle_collections_command(*args):
 
 def handle_list_all_docs_command(*args):
     """Handle the /list_all_docs command to list all unique documents in the knowledge base."""
-    db_client = DataBaseClient.get_instance()
-    
+    db_client = _require_db()
     if db_client is None:
-        default_ui.error(
-            UI_MESSAGES["errors"]["db_not_initialized"]
-        )
         return
     
     try:
-        import chromadb
-        from pathlib import Path
+        collection = db_client.db_client.get_collection('archive')
         
-        # Get all documents with metadata
-        results = db_client.db_client.get_collection('archive').get(
-            limit=50000,
-            include=['metadatas']
-        )
-        
-        # Extract unique file paths
+        # Page through the chunk metadata and fold each page into the set of
+        # unique file paths, so only one page of dicts is alive at a time
         unique_files = set()
-        for meta in results['metadatas']:
-            if meta and 'file_path' in meta:
-                unique_files.add(meta['file_path'])
-        
-        # Format output
-        output = []
-        for i, file_path in enumerate(sorted(unique_files), 1):
-            output.append(f"{i}. {Path(file_path).name}")
+        page_size = 5000
+        offset = 0
+        while True:
+            metadatas = collection.get(
+                limit=page_size,
+                offset=offset,
+                include=['metadatas']
+            )['metadatas']
+            unique_files.update(
+                meta['file_path'] for meta in metadatas
+                if meta and 'file_path' in meta
+            )
+            if len(metadatas) < page_size:
+                break
+            offset += page_size
         
-        message = f"Total unique documents: {len(unique_files)}\n\n" + "\n".join(output)
+        # Format output; stored paths are POSIX-style, so the file name is
+        # everything after the last '/' (no Path object per entry)
+        message = f"Total unique documents: {len(unique_files)}\n\n" + "\n".join(
+            f"{i}. {file_path.rpartition('/')[2]}"
+            for i, file_path in enumerate(sorted(unique_files), 1)
+        )
         default_ui.status_message(
             title="All Documents in Knowledge Base",
             message=message,
@@ -2,6 +2,8 @@ from app.src.embeddings.rag_errors import ScrapingFailedError
 from charset_normalizer import from_path
 from abc import ABC, abstractmethod
 from pathlib import Path
+import hashlib
+import os
 
 
 class Scraper(ABC):
@@ -28,16 +30,29 @@ class Scraper(ABC):
         """
         pass
 
+    def scrape_concurrently(self, path: str | Path) -> bool:
+        """Whether `path` may be scraped on a worker thread alongside other scrapes.
+
+        Scrapers backed by non-thread-safe libraries return False for the
+        affected files, which are then scraped on the calling thread.
+        """
+        return True
+
     @staticmethod
     def get_hash(file_path: str | Path) -> str:
         """Generate SHA-256 hash of a file."""
-        import hashlib
-
-        sha256_hash = hashlib.sha256()
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):  # Read in 4KB chunks
-                sha256_hash.update(chunk)
-        return sha256_hash.hexdigest()
+            if hasattr(hashlib, "file_digest"):  # Python 3.11+
+                # Hashes in C with a large buffer and the GIL released
+                return hashlib.file_digest(f, "sha256").hexdigest()
+
+            import mmap
+
+            sha256_hash = hashlib.sha256()
+            if os.fstat(f.fileno()).st_size:  # mmap can't map an empty file
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    sha256_hash.update(mm)
+            return sha256_hash.hexdigest()
 
     @staticmethod
     def _read_json_file(file_path: str | Path) -> str:
@@ -12,6 +12,10 @@ _RETRIED_DOCLING_SETUP = False
 
 class DoclingScraper(Scraper):
 
+    def scrape_concurrently(self, file_path: str | Path) -> bool:
+        """Only plain files; Docling's converters load models and PDF backends per call."""
+        return any(str(file_path).lower().endswith(x) for x in REGULAR_FILE_EXTENSIONS)
+
     def scrape(self, file_path: str | Path) -> dict:
         """Extract text and metadata from a file using Docling."""
 
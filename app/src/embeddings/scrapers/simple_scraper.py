@@ -1,6 +1,8 @@
 from app.src.embeddings.scrapers.abstract_scraper import Scraper
 from app.src.embeddings.rag_errors import ScrapingFailedError
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
 # docx
 from docx import Document
@@ -9,17 +11,131 @@ from docx.text.paragraph import Paragraph
 
 # pdf
 import pymupdf4llm
+import fitz
+
+# epub
+import lxml.html
+
 import datetime
+import threading
+import zipfile
 import signal
 import os
+import re
+
+# Control characters (including null bytes) mapped to spaces; \t \n \r are kept
+_CTRL_TABLE = {i: ' ' for i in range(32) if chr(i) not in '\n\r\t'}
+_WS_RE = re.compile(r'\s+')
+_TAG_RE = re.compile(r'<[^<]+?>')
+# lxml rejects str input that still carries an XML encoding declaration
+_XML_DECL_RE = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+# Runs of 6+ printable ASCII text bytes in a binary MOBI/AZW3 file
+_EBOOK_TEXT_RE = re.compile(rb"[0-9A-Za-z .,:;!?'\"()\[\]{}-]{6,}")
+
+# WordprocessingML tags read when flattening DOCX table cells
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P = _W_NS + "p"
+_W_T = _W_NS + "t"
+_W_BREAKS = (_W_NS + "tab", _W_NS + "br", _W_NS + "cr")
+
+# Threads reading and parsing EPUB chapters
+_EPUB_WORKERS = 8
+
+# Seconds the pymupdf4llm fallback may run before the PDF counts as failed
+_PDF_FALLBACK_TIMEOUT = 30
+
+# MuPDF isn't thread-safe, so every fitz/pymupdf4llm call holds this lock. A
+# timed-out fallback keeps it until it really ends; later PDFs wait at most
+# _PDF_FALLBACK_TIMEOUT for it instead of running MuPDF alongside it.
+_MUPDF_LOCK = threading.Lock()
+
+
+def _clean_pdf_pages(doc) -> list[str]:
+    """Extract and clean the text of every page of an open PDF."""
+    text_parts = []
+    for page in doc:
+        text = page.get_text()
+        if text.strip():
+            # Clean up problematic characters for embedding:
+            # control characters become spaces, then runs of
+            # whitespace collapse to a single space
+            cleaned = _WS_RE.sub(' ', text.translate(_CTRL_TABLE)).strip()
+            if cleaned:
+                text_parts.append(cleaned)
+    return text_parts
+
+
+def _call_with_timeout(func, timeout: float, *args, lock=None):
+    """Run func(*args) on a daemon thread, raising TimeoutError after `timeout` seconds.
+
+    Used where SIGALRM can't be armed (worker threads, Windows). An overrunning
+    call is abandoned rather than interrupted, but the caller is never stuck.
+    `lock`, already held by the caller, passes to the thread and is released
+    when func actually returns.
+    """
+    result = []
+    error = []
+
+    def _run():
+        try:
+            result.append(func(*args))
+        except BaseException as e:
+            error.append(e)
+        finally:
+            if lock is not None:
+                lock.release()
+
+    worker = threading.Thread(target=_run, daemon=True)
+    try:
+        worker.start()
+    except BaseException:
+        if lock is not None:
+            lock.release()
+        raise
+    worker.join(timeout)
+    if worker.is_alive():
+        raise TimeoutError("PDF extraction timeout - pymupdf4llm took too long")
+    if error:
+        raise error[0]
+    return result[0]
+
+
+def _cell_text(tc) -> str:
+    """Flatten a table cell's paragraphs into one line straight from its XML."""
+    return " ".join(
+        "".join(
+            (el.text or "") if el.tag == _W_T else " "
+            for el in p.iter(_W_T, *_W_BREAKS)
+        )
+        for p in tc.iterchildren(_W_P)
+    ).strip()
+
+
+def _html_to_text(content: bytes) -> str:
+    """Strip the tags from one HTML/XHTML document and collapse whitespace."""
+    # EPUB XHTML is UTF-8 by default; from bytes, lxml would guess Latin-1
+    # whenever a document declares no charset
+    markup = content.decode('utf-8-sig', errors='ignore')
+    try:
+        text = lxml.html.fromstring(_XML_DECL_RE.sub('', markup, count=1)).text_content()
+    except Exception:
+        # lxml rejects empty or badly broken documents; fall back to a tag strip
+        text = _TAG_RE.sub('', markup)
+    return _WS_RE.sub(' ', text).strip()
 
 
 class SimpleScraper(Scraper):
 
+    def scrape_concurrently(self, file_path: str | Path) -> bool:
+        """PDFs go through MuPDF, which isn't thread-safe; everything else can."""
+        return not str(file_path).lower().endswith(".pdf")
+
     def scrape(self, file_path: str | Path) -> dict:
         """Extract text and metadata from a file using simple methods."""
 
-        file_lower = str(file_path).lower()
+        path = Path(file_path)
+        file_lower = str(path).lower()
 
         if file_lower.endswith(".pdf"):
             try:
@@ -29,92 +145,98 @@ class SimpleScraper(Scraper):
 
         elif file_lower.endswith(".docx"):
             try:
-                text = self._extract_docx(file_path)
+                text = self._extract_docx(path)
             except Exception as e:
                 raise ScrapingFailedError(f"Failed to scrape DOCX file: {e}")
 
         elif file_lower.endswith((".epub", ".mobi", ".azw3")):
             try:
-                text = self._extract_ebook(file_path)
+                text = self._extract_ebook(path)
             except Exception as e:
                 raise ScrapingFailedError(f"Failed to scrape eBook file: {e}")
 
         else:
             try:
-                text = self.read_regular_file(file_path)
+                text = self.read_regular_file(path)
             except Exception as e:
                 raise ScrapingFailedError(f"Failed to scrape file: {e}")
 
         text = text.strip()
+        stat = path.stat()
 
         return {
             "content": text,
             "metadata": {
-                "file_path": Path(file_path).as_posix(),
-                "mod_date": datetime.datetime.fromtimestamp(
-                    Path(file_path).stat().st_mtime
-                ).isoformat(),
-                "hash": self.get_hash(file_path),
+                "file_path": path.as_posix(),
+                "mod_date": datetime.datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                "hash": self.get_hash(path),
             },
         }
 
     @staticmethod
     def _extract_pdf(file_path: str | Path) -> str:
         """Extract text from PDF using fast method (PyMuPDF)."""
+        if not _MUPDF_LOCK.acquire(timeout=_PDF_FALLBACK_TIMEOUT):
+            raise ScrapingFailedError(
+                f"PDF extraction still blocked by an earlier timed-out file: {file_path}"
+            )
+        owns_lock = True
         try:
-            # Try fast extraction first using fitz (PyMuPDF)
-            import fitz
-            
-            doc = fitz.open(file_path)
-            text_parts = []
-            
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                text = page.get_text()
-                if text.strip():
-                    # Clean up problematic characters for embedding
-                    # Remove null bytes and control characters except newlines/tabs
-                    cleaned = ''.join(
-                        c if c not in '\x00' and (ord(c) >= 32 or c in '\n\r\t') else ' '
-                        for c in text
-                    )
-                    # Replace multiple spaces/newlines with single space
-                    import re
-                    cleaned = re.sub(r'\s+', ' ', cleaned)
-                    if cleaned.strip():
-                        text_parts.append(cleaned.strip())
+            try:
+                # Try fast extraction first using fitz (PyMuPDF)
+                doc = fitz.open(file_path)
+                text_parts = _clean_pdf_pages(doc)
             
-            doc.close()
-            result = ' '.join(text_parts).strip()
+                doc.close()
+                result = ' '.join(text_parts).strip()
             
-            if not result:
-                raise ScrapingFailedError(f"PDF extraction returned empty content: {file_path}")
+                if not result:
+                    raise ScrapingFailedError(f"PDF extraction returned empty content: {file_path}")
             
-            return result
-        except ScrapingFailedError:
-            raise
-        except Exception as e:
-            # Fallback to pymupdf4llm if fitz fails (with timeout to prevent hanging)
-            try:
-                import pymupdf4llm
-                import signal
-                
-                def _timeout_handler(signum, frame):
-                    raise TimeoutError("PDF extraction timeout - pymupdf4llm took too long")
-                
-                # Set 30 second timeout for pymupdf4llm
-                signal.signal(signal.SIGALRM, _timeout_handler)
-                signal.alarm(30)
+                return result
+            except ScrapingFailedError:
+                raise
+            except Exception as e:
+                # Fallback to pymupdf4llm if fitz fails (with timeout to prevent hanging)
                 try:
-                    md = pymupdf4llm.to_markdown(file_path)
-                    signal.alarm(0)  # Cancel alarm if successful
-                    return md.strip()
-                except TimeoutError:
-                    raise ScrapingFailedError(f"PDF extraction timeout on {file_path}")
-                finally:
-                    signal.alarm(0)  # Always cancel alarm
-            except Exception as fallback_err:
-                raise ScrapingFailedError(f"Failed to extract PDF with both methods: fitz={e}, pymupdf4llm={fallback_err}")
+                    def _timeout_handler(signum, frame):
+                        raise TimeoutError("PDF extraction timeout - pymupdf4llm took too long")
+                
+                    # signals can only be installed from the main thread (and
+                    # SIGALRM doesn't exist on Windows); elsewhere the call runs
+                    # on a watchdog thread so the timeout still holds
+                    use_alarm = (
+                        hasattr(signal, "SIGALRM")
+                        and threading.current_thread() is threading.main_thread()
+                    )
+
+                    # Set 30 second timeout for pymupdf4llm
+                    if use_alarm:
+                        signal.signal(signal.SIGALRM, _timeout_handler)
+                        signal.alarm(_PDF_FALLBACK_TIMEOUT)
+                    try:
+                        if use_alarm:
+                            md = pymupdf4llm.to_markdown(file_path)
+                        else:
+                            # the watchdog thread takes over the MuPDF lock
+                            owns_lock = False
+                            md = _call_with_timeout(
+                                pymupdf4llm.to_markdown,
+                                _PDF_FALLBACK_TIMEOUT,
+                                file_path,
+                                lock=_MUPDF_LOCK,
+                            )
+                        return md.strip()
+                    except TimeoutError:
+                        raise ScrapingFailedError(f"PDF extraction timeout on {file_path}")
+                    finally:
+                        if use_alarm:
+                            signal.alarm(0)  # Always cancel alarm
+                except Exception as fallback_err:
+                    raise ScrapingFailedError(f"Failed to extract PDF with both methods: fitz={e}, pymupdf4llm={fallback_err}")
+        finally:
+            if owns_lock:
+                _MUPDF_LOCK.release()
 
     @staticmethod
     def _extract_docx(file_path: str | Path) -> str:
@@ -165,9 +287,6 @@ class SimpleScraper(Scraper):
     @staticmethod
     def _extract_ebook(file_path: str | Path) -> str:
         """Extract text from EPUB, MOBI, or AZW3 files."""
-        import zipfile
-        import xml.etree.ElementTree as ET
-        
         file_lower = str(file_path).lower()
         
         # EPUB is a ZIP file with HTML/XML content
@@ -175,19 +294,20 @@ class SimpleScraper(Scraper):
             try:
                 with zipfile.ZipFile(file_path, 'r') as zip_ref:
                     # Find all HTML/XHTML files
-                    text_parts = []
-                    for filename in zip_ref.namelist():
-                        if filename.endswith(('.html', '.xhtml', '.htm')):
-                            try:
-                                content = zip_ref.read(filename).decode('utf-8', errors='ignore')
-                                # Basic HTML tag removal
-                                import re
-                                text = re.sub('<[^<]+?>', '', content)
-                                text = re.sub(r'\s+', ' ', text)
-                                if text.strip():
-                                    text_parts.append(text.strip())
-                            except:
-                                pass
+                    names = [
+                        name for name in zip_ref.namelist()
+                        if name.endswith(('.html', '.xhtml', '.htm'))
+                    ]
+
+                    def _read_chapter(name: str) -> str:
+                        try:
+                            return _html_to_text(zip_ref.read(name))
+                        except Exception:
+                            return ''
+
+                    # Chapter reads overlap with lxml parsing, which runs in C
+                    with ThreadPoolExecutor(max_workers=_EPUB_WORKERS) as executor:
+                        text_parts = [text for text in executor.map(_read_chapter, names) if text]
                     return ' '.join(text_parts)
             except Exception as e:
                 raise ScrapingFailedError(f"Failed to extract EPUB: {e}")
@@ -205,12 +325,9 @@ class SimpleScraper(Scraper):
                     for item in book.get_items():
                         if item.get_type() == 9:  # 9 = EBOB_DOCUMENT
                             try:
-                                text = item.get_content().decode('utf-8', errors='ignore')
-                                import re
-                                text = re.sub('<[^<]+?>', '', text)
-                                text = re.sub(r'\s+', ' ', text)
-                                if text.strip():
-                                    text_parts.append(text.strip())
+                                text = _html_to_text(item.get_content())
+                                if text:
+                                    text_parts.append(text)
                             except:
                                 pass
                     if text_parts:
@@ -221,19 +338,12 @@ class SimpleScraper(Scraper):
                 # Fallback: Extract printable ASCII text from binary file
                 with open(file_path, 'rb') as f:
                     content = f.read()
-                # Extract printable ASCII strings
-                import re
-                printable = set('0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ \t\n\r.,:;!?\'"-()[]{}')
-                text_parts = []
-                current_string = []
-                for byte in content:
-                    char = chr(byte) if 32 <= byte <= 126 else ''
-                    if char and char in printable:
-                        current_string.append(char)
-                    elif current_string and len(''.join(current_string)) > 5:
-                        text_parts.append(''.join(current_string))
-                        current_string = []
-                return ' '.join(text_parts[:500])  # Limit to avoid huge outputs
+                # Extract runs of printable ASCII text
+                text_parts = [
+                    m.group().decode('ascii')
+                    for m in islice(_EBOOK_TEXT_RE.finditer(content), 500)  # Limit to avoid huge outputs
+                ]
+                return ' '.join(text_parts)
             except Exception as e:
                 raise ScrapingFailedError(f"Failed to extract eBook: {e}")
         
@@ -247,7 +357,7 @@ class SimpleScraper(Scraper):
 
         lines = []
         for row_idx, row in enumerate(table.rows):
-            cells = [cell.text.strip().replace("\n", " ") for cell in row.cells]
+            cells = [_cell_text(cell._tc) for cell in row.cells]
             lines.append("| " + " | ".join(cells) + " |")
 
             if row_idx == 0:
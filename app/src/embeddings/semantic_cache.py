@@ -0,0 +1,69 @@
+from collections import OrderedDict
+from typing import Any
+import time
+
+
+class SemanticCache:
+    """In-process LRU cache of query results keyed by the query embedding.
+
+    A lookup hits when a cached query's embedding is within `max_distance`
+    (cosine distance) of the new one and the entry is younger than `ttl`
+    seconds, so repeated or near-identical queries skip the vector search.
+    """
+
+    def __init__(
+        self, max_distance: float = 0.05, ttl: float = 300.0, maxsize: int = 256
+    ) -> None:
+        self.max_distance = max_distance
+        self.ttl = ttl
+        self.maxsize = maxsize
+        # key -> (normalized embedding, results, insertion time), oldest use first
+        self._entries: OrderedDict[int, tuple[Any, Any, float]] = OrderedDict()
+        self._next_key = 0
+
+    @staticmethod
+    def _normalize(embedding: list[float]):
+        import numpy as np
+
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _evict_expired(self) -> None:
+        cutoff = time.monotonic() - self.ttl
+        for key in [k for k, (_, _, t) in self._entries.items() if t < cutoff]:
+            del self._entries[key]
+
+    def get(self, embedding: list[float]) -> Any | None:
+        """Return the cached results of the closest fresh query, or None."""
+        import numpy as np
+
+        self._evict_expired()
+        if not self._entries:
+            return None
+
+        keys = list(self._entries)
+        vectors = np.stack([self._entries[key][0] for key in keys])
+        similarities = vectors @ self._normalize(embedding)
+        best = int(similarities.argmax())
+        if 1.0 - float(similarities[best]) > self.max_distance:
+            return None
+
+        key = keys[best]
+        self._entries.move_to_end(key)
+        return self._entries[key][1]
+
+    def put(self, embedding: list[float], results: Any) -> None:
+        """Cache `results` for the query `embedding`, evicting the LRU entry when full."""
+        self._entries[self._next_key] = (
+            self._normalize(embedding),
+            results,
+            time.monotonic(),
+        )
+        self._next_key += 1
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry, e.g. after the indexed documents change."""
+        self._entries.clear()
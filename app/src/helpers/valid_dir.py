@@ -1,16 +1,20 @@
 import os
+import re
 from pathlib import Path
 
 
 WINDOWS_INVALID_CHARS = '<>"/\\|?*'  # Removed ':' as it's allowed in filenames except at position 1 (drive letter)
-WINDOWS_RESERVED_NAMES = {
+WINDOWS_RESERVED_NAMES = frozenset({
     "CON",
     "PRN",
     "AUX",
     "NUL",
     *(f"COM{i}" for i in range(1, 10)),
     *(f"LPT{i}" for i in range(1, 10)),
-}
+})
+
+# Single C-level scan for any of WINDOWS_INVALID_CHARS
+_WINDOWS_INVALID_RE = re.compile(f"[{re.escape(WINDOWS_INVALID_CHARS)}]")
 
 
 def validate_dir_name(path: str) -> bool:
@@ -31,10 +35,10 @@ def validate_dir_name(path: str) -> bool:
         # Windows-specific checks
         if os.name == "nt":
 
-            if part.upper().split(".")[0] in WINDOWS_RESERVED_NAMES:
+            if part.partition(".")[0].upper() in WINDOWS_RESERVED_NAMES:
                 return False
 
-            if any(c in WINDOWS_INVALID_CHARS for c in part):
+            if _WINDOWS_INVALID_RE.search(part):
                 return False
 
             # Colon is only invalid at position 1 (after drive letter)
@@ -10,10 +10,22 @@ CHUNK_SIZE = 1000
 # Overlap between chunks to maintain context
 CHUNK_OVERLAP = 100
 # Number of chunks to embed in one batch (Ollama batch size)
-# Reduced to 1 to prevent Ollama crashes - embed one at a time
-BATCH_SIZE = 1
+# The Ollama embedder bisects a batch it can't embed, so one bad chunk
+# no longer takes the whole batch down
+BATCH_SIZE = 32
+# Number of embedding batches in flight at once (set to 1 for single-worker Ollama);
+# embedders declaring a lower max_concurrent_batches (local HF models) use that
+EMBED_WORKERS = int(os.environ.get("JAZZ_EMBED_WORKERS", "4"))
+# Number of files scraped ahead of embedding while a directory is ingested
+SCRAPE_WORKERS = int(os.environ.get("JAZZ_SCRAPE_WORKERS", "2"))
 # Maximum search results for RAG queries (increased for better coverage)
 MAX_RESULTS = 20
+# HNSW index parameters applied when a collection is created (Chroma's
+# defaults are M=16, construction_ef=100, search_ef=10); existing collections
+# keep the parameters they were built with
+HNSW_M = 24
+HNSW_EF_CONSTRUCTION = 128
+HNSW_EF_SEARCH = 100
 
 
 LAST_N_TURNS = 20
@@ -3,58 +3,139 @@
 
 import re
 from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
+from operator import methodcaller
+
+# Patterns used per sentence, compiled once
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+_match_text = methodcaller("group")
+
+_STOP_WORDS = frozenset({
+    "the", "and", "for", "with", "that", "this", "from", "about", "into",
+    "have", "has", "was", "were", "are", "been", "their", "there", "which",
+    "when", "your", "you", "they", "them", "she", "him", "his", "her",
+    "not", "but", "can", "will", "just", "like", "than",
+})
+# Topic terms always kept as keywords when they appear in the prompt
+_FORCED_KEYWORDS = ("megatron", "transformers", "idw")
+_NUM_RE = re.compile(r'\d{1,4}')
+_PROPER_RE = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')
+
+# Fixed-word features matched as whole words, case-insensitively
+_FEATURE_LISTS = {
+    "causal": ("led to", "caused", "resulted in", "because", "due to", "through", "via", "by"),
+    "comparison": ("like", "similar to", "compared to", "as", "mirror", "parallel", "akin to"),
+    "adjectives": ("revolutionary", "oppressive", "tyrannical", "authoritarian", "brutal",
+                   "violent", "powerful", "radical", "heroic", "noble"),
+}
+# Single words per feature, checked against one tokenization per sentence
+_FEATURE_SETS = {
+    feature: frozenset(w for w in words if " " not in w)
+    for feature, words in _FEATURE_LISTS.items()
+}
+# Two-word phrases are confirmed with a regex, only when a leading word is present
+_FEATURE_PHRASES = {
+    w: feature for feature, words in _FEATURE_LISTS.items() for w in words if " " in w
+}
+_PHRASE_LEADS = frozenset(p.split(" ", 1)[0] for p in _FEATURE_PHRASES)
+_PHRASE_RE = re.compile(r'\b(' + '|'.join(_FEATURE_PHRASES) + r')\b')
+_WORD_RE = re.compile(r'\w+')
+
+def _word_features(sent_lower: str) -> set[str]:
+    """Collect which fixed-word features appear in a lowercased sentence."""
+    words = frozenset(_WORD_RE.findall(sent_lower))
+    features = {f for f, vocab in _FEATURE_SETS.items() if not vocab.isdisjoint(words)}
+    if not _PHRASE_LEADS.isdisjoint(words):
+        features.update(_FEATURE_PHRASES[m] for m in _PHRASE_RE.findall(sent_lower))
+    return features
+
+def _iter_sentences(text: str) -> Iterator[str]:
+    """Split after '.', '!' or '?' followed by whitespace, using str.find.
+
+    Yields the same pieces as re.split(r'(?<=[.!?])\\s+', text), lazily, so
+    callers that stop early never scan the rest of the text.
+    """
+    start = 0
+    n = len(text)
+    # next position of each terminator, refreshed only once it's been passed
+    nxt = {p: text.find(p) for p in ".!?"}
+    while True:
+        live = [j for j in nxt.values() if j != -1]
+        if not live:
+            break
+        j = min(live)
+        end = j + 1
+        while end < n and text[end].isspace():
+            end += 1
+        if end > j + 1:
+            yield text[start:j + 1]
+            start = end
+        for p, pos in nxt.items():
+            if pos != -1 and pos < end:
+                nxt[p] = text.find(p, end)
+    yield text[start:]
 
 def build_relevance_keywords(user_input: str, enhanced_query: str) -> list[str]:
+    # copy, so callers can't mutate the cached keywords
+    return list(_relevance_keywords(user_input, enhanced_query))
+
+@lru_cache(maxsize=256)
+def _relevance_keywords(user_input: str, enhanced_query: str) -> tuple[str, ...]:
+    """Pure function of its inputs, so repeated prompts skip re-tokenizing."""
     text = f"{user_input} {enhanced_query}".lower()
-    tokens = re.findall(r"[a-z0-9']+", text)
-    stop_words = {
-        "the", "and", "for", "with", "that", "this", "from", "about", "into",
-        "have", "has", "was", "were", "are", "been", "their", "there", "which",
-        "when", "your", "you", "they", "them", "she", "him", "his", "her",
-        "not", "but", "can", "will", "just", "like", "than",
-    }
-    freq = Counter(t for t in tokens if len(t) > 2 and t not in stop_words)
-    keywords = [w for w, _ in freq.most_common(12)]
-    if not keywords:
-        keywords = [t for t in tokens if len(t) > 4][:8]
-    if "megatron" in text and "megatron" not in keywords:
-        keywords.append("megatron")
-    if "transformers" in text and "transformers" not in keywords:
-        keywords.append("transformers")
-    if "idw" in text and "idw" not in keywords:
-        keywords.append("idw")
-    return keywords
+    freq = Counter(
+        t for t in map(_match_text, _TOKEN_RE.finditer(text))
+        if len(t) > 2 and t not in _STOP_WORDS
+    )
+    if freq:
+        keywords = [w for w, _ in freq.most_common(12)]
+    else:
+        # rare (only stop words or short tokens), so the text is re-scanned here
+        # instead of keeping a token list around for every call
+        tokens = map(_match_text, _TOKEN_RE.finditer(text))
+        keywords = list(islice((t for t in tokens if len(t) > 4), 8))
+    for kw in _FORCED_KEYWORDS:
+        if kw in text and kw not in keywords:
+            keywords.append(kw)
+    return tuple(keywords)
 
 def smart_extract_facts(content: str, max_facts: int = 5) -> list[str]:
     facts = []
-    sentences = re.split(r'(?<=[.!?])\s+', content[:4000])
+    # Slicing a shorter string returns it as is, so this only copies long pages
+    sentences = _iter_sentences(content[:4000])
+    head = []  # first six stripped sentences, kept for the fallback
     for sent in sentences:
         sent = sent.strip()
+        if len(head) < 6:
+            head.append(sent)
         if len(sent) < 40 or len(sent) > 500:
             continue
-        has_numbers = bool(re.search(r'\d{1,4}', sent))
-        has_proper_nouns = bool(re.search(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', sent))
-        has_causal = bool(re.search(r'\b(led to|caused|resulted in|because|due to|through|via|by)\b', sent, re.I))
-        has_comparison = bool(re.search(r'\b(like|similar to|compared to|as|mirror|parallel|akin to)\b', sent, re.I))
-        has_adjectives = bool(re.search(r'\b(revolutionary|oppressive|tyrannical|authoritarian|brutal|violent|powerful|radical|heroic|noble)\b', sent, re.I))
-        score = 0
-        if has_numbers:
+        # Only the >= 3 threshold matters, so the number and proper-noun
+        # scans are skipped once the feature words already reach it
+        features = _word_features(sent.lower())
+        score = (
+            3 * (("causal" in features) | ("comparison" in features))
+            + 2 * ("adjectives" in features)
+        )
+        if score < 3 and _NUM_RE.search(sent):
             score += 2
-        if has_proper_nouns:
+        if score < 3 and _PROPER_RE.search(sent):
             score += 1
-        if has_causal or has_comparison:
-            score += 3
-        if has_adjectives:
-            score += 2
         if score >= 3:
             facts.append(sent)
             if len(facts) >= max_facts:
                 break
     if len(facts) < 2:
-        for sent in sentences[:6]:
-            sent = sent.strip()
-            if len(sent) > 40 and len(sent) < 500 and sent not in facts:
+        seen = set(facts)
+        # resume the split only if the loop above stopped inside the first six
+        head.extend(islice(map(str.strip, sentences), 6 - len(head)))
+        for sent in head:
+            if len(sent) > 40 and len(sent) < 500 and sent not in seen:
                 facts.append(sent)
+                seen.add(sent)
                 if len(facts) >= max_facts:
                     break
     return facts
@@ -94,6 +175,14 @@ print("DEMONSTRATING SMART FACT EXTRACTION")
 print("="*80 + "\n")
 
 total_fact_count = 0
+# identical page content (mirrors, syndicated copies) is extracted only once,
+# and the distinct pages are extracted concurrently before anything is printed
+unique_contents = list(dict.fromkeys(content for _, content in mock_results))
+with ThreadPoolExecutor(max_workers=min(8, len(unique_contents))) as executor:
+    extracted_by_content = dict(zip(
+        unique_contents,
+        executor.map(partial(smart_extract_facts, max_facts=4), unique_contents),
+    ))
 for i, (result, content) in enumerate(mock_results, 1):
     print(f"\n╔════ WEB RESULT {i} ════════════════════════════════════════╗")
     print(f"║ TITLE: {result['title']}")
@@ -101,7 +190,7 @@ for i, (result, content) in enumerate(mock_results, 1):
     print(f"╚═════════════════════════════════════════════════════════════════╝")
     print(f"EXTRACTED FACTS (cite these verbatim):\n")
     
-    extracted = smart_extract_facts(content, max_facts=4)
+    extracted = extracted_by_content[content]
     
     for j, fact in enumerate(extracted, 1):
         total_fact_count += 1
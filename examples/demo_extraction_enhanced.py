@@ -3,102 +3,177 @@
 
 import re
 from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
+from operator import itemgetter, methodcaller
+
+# Patterns used per sentence, compiled once
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+_match_text = methodcaller("group")
+
+_STOP_WORDS = frozenset({
+    "the", "and", "for", "with", "that", "this", "from", "about", "into",
+    "have", "has", "was", "were", "are", "been", "their", "there", "which",
+    "when", "your", "you", "they", "them", "she", "him", "his", "her",
+    "not", "but", "can", "will", "just", "like", "than",
+})
+# Topic terms always kept as keywords when they appear in the prompt
+_FORCED_KEYWORDS = ("megatron", "transformers", "idw")
+# No leading \b, so compounds like "steelworker" count too; kept as its own scan
+_PERSON_RE = re.compile(r'(worker|coworker|colleague|friend|guard|officer)\b', re.I)
+
+# Fixed-word features matched as whole words, case-insensitively.
+# A word can carry several features ("killed" is an event and a death).
+_FEATURE_LISTS = {
+    "event_verbs": ("killed", "murdered", "died", "executed", "attacked", "rebelled",
+                    "revolted", "witnessed", "saw", "discovered", "encountered",
+                    "confronted", "snapped", "triggered", "sparked"),
+    "location": ("mine", "mines", "factory", "workplace", "prison", "cell", "street"),
+    "death_trauma": ("died", "death", "murder", "murdered", "killed", "atrocity", "tragedy"),
+    "causal": ("led to", "caused", "resulted in", "because", "due to", "triggered by",
+               "fueled by", "driven by"),
+    "comparison": ("like", "similar to", "compared to", "mirror", "parallel", "akin to",
+                   "parallels"),
+    "adjectives": ("revolutionary", "oppressive", "tyrannical", "authoritarian", "brutal",
+                   "violent", "radical", "heroic", "noble"),
+}
+# Single words per feature, checked against one tokenization per sentence
+_FEATURE_SETS = {
+    feature: frozenset(w for w in words if " " not in w)
+    for feature, words in _FEATURE_LISTS.items()
+}
+# Two-word phrases are confirmed with a regex, only when a leading word is present
+_FEATURE_PHRASES = {
+    w: feature for feature, words in _FEATURE_LISTS.items() for w in words if " " in w
+}
+_PHRASE_LEADS = frozenset(p.split(" ", 1)[0] for p in _FEATURE_PHRASES)
+_PHRASE_RE = re.compile(r'\b(' + '|'.join(_FEATURE_PHRASES) + r')\b')
+_WORD_RE = re.compile(r'\w+')
+
+def _word_features(sent_lower: str) -> set[str]:
+    """Collect which fixed-word features appear in a lowercased sentence."""
+    words = frozenset(_WORD_RE.findall(sent_lower))
+    features = {f for f, vocab in _FEATURE_SETS.items() if not vocab.isdisjoint(words)}
+    if not _PHRASE_LEADS.isdisjoint(words):
+        features.update(_FEATURE_PHRASES[m] for m in _PHRASE_RE.findall(sent_lower))
+    return features
+
+_NUM_RE = re.compile(r'\d{1,4}')
+_PROPER_RE = re.compile(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b')
+
+def _iter_sentences(text: str) -> Iterator[str]:
+    """Split after '.', '!' or '?' followed by whitespace, using str.find.
+
+    Yields the same pieces as re.split(r'(?<=[.!?])\\s+', text), lazily, so
+    callers that stop early never scan the rest of the text.
+    """
+    start = 0
+    n = len(text)
+    # next position of each terminator, refreshed only once it's been passed
+    nxt = {p: text.find(p) for p in ".!?"}
+    while True:
+        live = [j for j in nxt.values() if j != -1]
+        if not live:
+            break
+        j = min(live)
+        end = j + 1
+        while end < n and text[end].isspace():
+            end += 1
+        if end > j + 1:
+            yield text[start:j + 1]
+            start = end
+        for p, pos in nxt.items():
+            if pos != -1 and pos < end:
+                nxt[p] = text.find(p, end)
+    yield text[start:]
 
 def build_relevance_keywords(user_input: str, enhanced_query: str) -> list[str]:
+    # copy, so callers can't mutate the cached keywords
+    return list(_relevance_keywords(user_input, enhanced_query))
+
+@lru_cache(maxsize=256)
+def _relevance_keywords(user_input: str, enhanced_query: str) -> tuple[str, ...]:
+    """Pure function of its inputs, so repeated prompts skip re-tokenizing."""
     text = f"{user_input} {enhanced_query}".lower()
-    tokens = re.findall(r"[a-z0-9']+", text)
-    stop_words = {
-        "the", "and", "for", "with", "that", "this", "from", "about", "into",
-        "have", "has", "was", "were", "are", "been", "their", "there", "which",
-        "when", "your", "you", "they", "them", "she", "him", "his", "her",
-        "not", "but", "can", "will", "just", "like", "than",
-    }
-    freq = Counter(t for t in tokens if len(t) > 2 and t not in stop_words)
-    keywords = [w for w, _ in freq.most_common(12)]
-    if not keywords:
-        keywords = [t for t in tokens if len(t) > 4][:8]
-    if "megatron" in text and "megatron" not in keywords:
-        keywords.append("megatron")
-    if "transformers" in text and "transformers" not in keywords:
-        keywords.append("transformers")
-    if "idw" in text and "idw" not in keywords:
-        keywords.append("idw")
-    return keywords
+    freq = Counter(
+        t for t in map(_match_text, _TOKEN_RE.finditer(text))
+        if len(t) > 2 and t not in _STOP_WORDS
+    )
+    if freq:
+        keywords = [w for w, _ in freq.most_common(12)]
+    else:
+        # rare (only stop words or short tokens), so the text is re-scanned here
+        # instead of keeping a token list around for every call
+        tokens = map(_match_text, _TOKEN_RE.finditer(text))
+        keywords = list(islice((t for t in tokens if len(t) > 4), 8))
+    for kw in _FORCED_KEYWORDS:
+        if kw in text and kw not in keywords:
+            keywords.append(kw)
+    return tuple(keywords)
 
 def smart_extract_facts(content: str, max_facts: int = 5) -> list[str]:
     """Enhanced extraction that PRIORITIZES story events and specific incidents."""
     facts = []
-    sentences = re.split(r'(?<=[.!?])\s+', content[:4000])
+    sentences = _iter_sentences(content[:4000])
     
-    # Categorize by priority
-    story_events = []      # Events, incidents, turning points (HIGHEST PRIORITY)
-    causal_claims = []     # Causality explaining motivation
-    comparisons = []       # Analogies and comparisons
-    generic_facts = []     # General statements
+    # (priority, -score, sentence, lowercased sentence for dedup); priority
+    # 0 = story events (HIGHEST), 1 = causal claims, 2 = comparisons,
+    # 3 = generic facts ranked by score
+    candidates = []
+    # distinct story events so far; once they fill max_facts nothing later can rank higher
+    top_events = set()
     
     for sent in sentences:
         sent = sent.strip()
         if len(sent) < 40 or len(sent) > 500:
             continue
+        sent_lower = sent.lower()
         
-        # Check for story elements (PRIORITY 1)
-        has_event_verbs = bool(re.search(
-            r'\b(killed|murdered|died|executed|attacked|rebelled|revolted|witnessed|saw|'
-            r'discovered|encountered|confronted|snapped|triggered|sparked|witnessed)\b', 
-            sent, re.I))
-        has_location = bool(re.search(r'\b(mine|mines|factory|workplace|prison|cell|street)\b', sent, re.I))
-        has_specific_person = bool(re.search(r'(worker|coworker|colleague|friend|guard|officer)\b', sent, re.I))
-        has_death_trauma = bool(re.search(r'\b(died|death|murder|murdered|killed|atrocity|tragedy)\b', sent, re.I))
-        
-        # Check for causality (PRIORITY 2)
-        has_causal = bool(re.search(
-            r'\b(led to|caused|resulted in|because|due to|triggered by|fueled by|driven by)\b', 
-            sent, re.I))
-        
-        # Check for comparison (PRIORITY 3)
-        has_comparison = bool(re.search(
-            r'\b(like|similar to|compared to|mirror|parallel|akin to|parallels)\b', 
-            sent, re.I))
-        
-        # Check for descriptive content
-        has_adjectives = bool(re.search(
-            r'\b(revolutionary|oppressive|tyrannical|authoritarian|brutal|violent|radical|heroic|noble)\b', 
-            sent, re.I))
-        has_numbers = bool(re.search(r'\d{1,4}', sent))
-        has_proper_nouns = bool(re.search(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', sent))
+        # Feature words come from one scan; the remaining regexes only run
+        # when the priority cascade below still needs their answer
+        features = _word_features(sent_lower)
+        has_event_verbs = "event_verbs" in features
+        has_death_trauma = "death_trauma" in features
+        has_adjectives = "adjectives" in features
         
         # PRIORITY 1: Story events with specific details (HIGHEST VALUE)
-        if (has_event_verbs or has_death_trauma) and (has_location or has_specific_person):
-            story_events.append(sent)
+        if (has_event_verbs or has_death_trauma) and (
+            "location" in features or _PERSON_RE.search(sent)
+        ):
+            candidates.append((0, 0, sent, sent_lower))
+            top_events.add(sent_lower)
+            if len(top_events) >= max_facts:
+                break
+            continue
         
         # PRIORITY 2: Causal claims
-        elif has_causal and (has_adjectives or has_event_verbs):
-            causal_claims.append(sent)
+        if "causal" in features and (has_adjectives or has_event_verbs):
+            candidates.append((1, 0, sent, sent_lower))
+            continue
         
         # PRIORITY 3: Comparisons
-        elif has_comparison and has_proper_nouns:
-            comparisons.append(sent)
+        has_proper_nouns = bool(_PROPER_RE.search(sent))
+        if "comparison" in features and has_proper_nouns:
+            candidates.append((2, 0, sent, sent_lower))
+            continue
         
         # PRIORITY 4: Generic facts
-        else:
-            score = 0
-            if has_numbers:
-                score += 2
-            if has_proper_nouns:
-                score += 1
-            if has_adjectives:
-                score += 2
-            if score >= 3:
-                generic_facts.append((sent, score))
+        score = (
+            2 * (_NUM_RE.search(sent) is not None)
+            + has_proper_nouns
+            + 2 * has_adjectives
+        )
+        if score >= 3:
+            candidates.append((3, -score, sent, sent_lower))
     
-    # Merge in priority order
-    generic_facts.sort(key=lambda x: x[1], reverse=True)
-    all_facts = story_events + causal_claims + comparisons + [s for s, _ in generic_facts]
+    # Stable sort: priority order, then score, then order of appearance
+    candidates.sort(key=itemgetter(0, 1))
     
     # Extract unique facts
     seen = set()
-    for sent in all_facts:
-        sent_lower = sent.lower()
+    for _, _, sent, sent_lower in candidates:
         if sent_lower not in seen:
             facts.append(sent)
             seen.add(sent_lower)
@@ -172,6 +247,14 @@ print("(With Story Events & Specific Incidents Prioritized)")
 print("="*80 + "\n")
 
 total_fact_count = 0
+# identical page content (mirrors, syndicated copies) is extracted only once,
+# and the distinct pages are extracted concurrently before anything is printed
+unique_contents = list(dict.fromkeys(content for _, content in mock_results))
+with ThreadPoolExecutor(max_workers=min(8, len(unique_contents))) as executor:
+    extracted_by_content = dict(zip(
+        unique_contents,
+        executor.map(partial(smart_extract_facts, max_facts=4), unique_contents),
+    ))
 for i, (result, content) in enumerate(mock_results, 1):
     print(f"\n╔════ WEB RESULT {i} ════════════════════════════════════════╗")
     print(f"║ TITLE: {result['title']}")
@@ -179,7 +262,7 @@ for i, (result, content) in enumerate(mock_results, 1):
     print(f"╚═════════════════════════════════════════════════════════════════╝")
     print(f"EXTRACTED FACTS (prioritizes story events & incidents):\n")
     
-    extracted = smart_extract_facts(content, max_facts=4)
+    extracted = extracted_by_content[content]
     
     for j, fact in enumerate(extracted, 1):
         total_fact_count += 1
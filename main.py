@@ -7,19 +7,23 @@ See LICENSE and ATTRIBUTION.md for details
 """
 
 import os, sys
+from warnings import filterwarnings, simplefilter
 
 # If running non-interactively (single-shot), set QUIET early so imports
 # and agent/console initialization don't print banners. Look for flags in argv.
 ARGS = " ".join(sys.argv[1:])
 if "--once" in ARGS or "--json" in ARGS:
     os.environ["JAZZ_QUIET"] = "1"
+    # One catch-all filter, installed before the heavy imports so their
+    # warnings can't reach the output either; -W / PYTHONWARNINGS still win
+    if not sys.warnoptions:
+        simplefilter("ignore")
 
 from dotenv import load_dotenv
 load_dotenv()
 
 from app import CLI, default_ui
 
-from warnings import filterwarnings
 import os
 import sys
 import json
@@ -27,9 +31,8 @@ import logging
 
 
 logging.basicConfig(level=logging.CRITICAL)
-filterwarnings("ignore", category=Warning, module="torch")
-filterwarnings("ignore", category=Warning, module="docling")
-filterwarnings("ignore", category=Warning, module="huggingface_hub")
+# A single filter entry, since warnings.filters is scanned on every warn() call
+filterwarnings("ignore", category=Warning, module="torch|docling|huggingface_hub")
 
 
 api_keys = {
@@ -47,8 +50,8 @@ api_keys = {
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 config_path = os.path.join(BASE_DIR, "config.json")
 try:
-    with open(config_path) as f:
-        config = json.load(f)
+    with open(config_path, "rb") as f:
+        config = json.loads(f.read())
     # Set Ollama URL env vars if present in config so downstream libs can connect
     if "ollama_host" in config:
         ollama_url = config["ollama_host"].rstrip("/")